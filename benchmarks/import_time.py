@@ -0,0 +1,87 @@
+"""Benchmark of the time that it takes to import qalib, as measured by `python -X importtime -c "import qalib"`.
+
+Every run imports qalib in a fresh interpreter, and the median of the runs is reported along with the modules that
+took the longest to import. The benchmark fails if the median exceeds --max-ms, or if a module listed by --forbid is
+imported, so that it can be tracked in CI.
+
+Usage:
+    python benchmarks/import_time.py --runs 10 --top 15 --forbid emoji discord_emoji
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(module: str) -> List[ImportTime]:
+    """Imports the module in a fresh interpreter, and parses the timings reported by -X importtime.
+
+    Args:
+        module (str): name of the module that is imported
+
+    Returns (List[ImportTime]): the import time of every module that was imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="qalib", help="module that is imported")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters that import the module")
+    parser.add_argument("--top", type=int, default=10, help="number of the slowest modules that are listed")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median import time exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=[], help="fail if any of these modules are imported")
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    self_times: Dict[str, List[int]] = {}
+    imported = set()
+    for _ in range(args.runs):
+        times = measure(args.module)
+        totals.append(next(time.cumulative_us for time in times if time.module == args.module) / 1000)
+        for time in times:
+            self_times.setdefault(time.module, []).append(time.self_us)
+            imported.add(time.module)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median {median:.1f} ms, min {min(totals):.1f} ms over {args.runs} runs")
+    print(f"{'module':<50} {'self [ms]':>10}")
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for module, samples in slowest[: args.top]:
+        print(f"{module:<50} {statistics.median(samples) / 1000:>10.2f}")
+
+    failed = False
+    for module in args.forbid:
+        if module in imported:
+            print(f"FAIL: {module} is imported by {args.module}")
+            failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median import time {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Benchmark of the time that it takes to build a view with 25 buttons that have callbacks, which is the most
+components that a discord message can hold.
+
+The buttons are created with create_button, which reuses a single dispatching subclass of ui.Button, and compared
+against creating a new subclass with type() for every button, which is how the buttons used to be created. The views
+are built on a running event loop, as discord.py views require one. The benchmark fails if the median exceeds
+--max-ms, so that it can be tracked in CI.
+
+Usage:
+    python benchmarks/view_build.py --runs 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import discord
+from discord import ui
+
+from qalib.translators.message_parsing import ButtonComponent, create_button
+from qalib.translators.view import QalibView
+
+BUTTONS = 25
+
+
+async def on_click(item: ui.Item, interaction: discord.Interaction) -> None:
+    pass
+
+
+def create_subclassed_button(component: ButtonComponent) -> ui.Button:
+    """Creates the button with a new subclass of ui.Button for its callback, for comparison."""
+
+    async def callback(item: ui.Item, interaction: discord.Interaction) -> None:
+        await component["callback"](item, interaction)
+
+    button = type(ui.Button.__name__, (ui.Button,), {"callback": callback})
+    return button(style=discord.ButtonStyle.primary, custom_id=component.get("custom_id"), label=component.get("label"))
+
+
+def build_view(create: Callable[[ButtonComponent], ui.Button]) -> QalibView:
+    view = QalibView({})
+    for index in range(BUTTONS):
+        view.add_item(create({"custom_id": f"button{index}", "label": f"Button {index}", "callback": on_click}))
+    return view
+
+
+async def measure(create: Callable[[ButtonComponent], ui.Button], runs: int) -> List[float]:
+    """Builds the view the given number of times.
+
+    Args:
+        create (Callable[[ButtonComponent], ui.Button]): function that creates the buttons
+        runs (int): number of views that are built
+
+    Returns (List[float]): the time that it took to build every view in milliseconds
+    """
+    build_view(create)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build_view(create)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=100, help="number of views that are built")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median time of a view exceeds this")
+    args = parser.parse_args()
+
+    reused = asyncio.run(measure(create_button, args.runs))
+    subclassed = asyncio.run(measure(create_subclassed_button, args.runs))
+    print(f"view with {BUTTONS} buttons over {args.runs} runs")
+    print(f"{'buttons':<30} {'median [ms]':>12} {'min [ms]':>10}")
+    print(f"{'create_button':<30} {statistics.median(reused):>12.3f} {min(reused):>10.3f}")
+    print(f"{'type() per button':<30} {statistics.median(subclassed):>12.3f} {min(subclassed):>10.3f}")
+
+    median = statistics.median(reused)
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median time to build a view {median:.3f} ms exceeds {args.max_ms:.3f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
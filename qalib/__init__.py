@@ -15,7 +15,7 @@ from discord.ext import commands
 
 from .context import QalibContext
 from .interaction import QalibInteraction
-from .renderer import Renderer, RenderingOptions
+from .renderer import Renderer, RenderingOptions, warmup
 from .template_engines.template_engine import TemplateEngine
 
 __title__ = "qalib"
@@ -29,7 +29,7 @@ Coro = Coroutine[Any, Any, T]
 
 
 def qalib_context(
-    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions
+    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions, **renderer_kwargs: Any
 ) -> Callable[[Callable[..., Coro[T]]], Callable[..., Coro[T]]]:
     """This decorator is used to create a QalibContext object, and pass it to the function as it's first argument,
     overriding the default context.
@@ -38,10 +38,11 @@ def qalib_context(
         template_engine (TemplateEngine): template engine that is used to template the document
         filename (str): filename of the document
         renderer_options (RenderingOptions): options for the renderer
+        **renderer_kwargs (Any): keyword arguments of the renderer, such as the executor that render_async offloads to
 
     Returns (QalibContext): decorated function that takes the Context object and using the extended QalibContext object
     """
-    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options)
+    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options, **renderer_kwargs)
 
     def command(func: Callable[..., Coro[T]]) -> Callable[..., Coro[T]]:
         if discord.utils.is_inside_class(func):
@@ -62,7 +63,7 @@ def qalib_context(
 
 
 def qalib_interaction(
-    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions
+    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions, **renderer_kwargs: Any
 ) -> Callable[[Callable[..., Coro[T]]], Callable[..., Coro[T]]]:
     """This decorator is used to create a QalibInteraction object, and pass it to the function as it's first argument,
     overriding the default interaction.
@@ -71,11 +72,12 @@ def qalib_interaction(
         template_engine (TemplateEngine): template engine that is used to template the document
         filename (str): filename of the document
         renderer_options (RenderingOptions): options for the renderer
+        **renderer_kwargs (Any): keyword arguments of the renderer, such as the executor that render_async offloads to
 
     Returns (Callable): decorated function that takes the Interaction object and using the extended
     QalibInteraction object
     """
-    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options)
+    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options, **renderer_kwargs)
 
     def command(func: Callable[..., Coro[T]]) -> Callable[..., Coro[T]]:
         if discord.utils.is_inside_class(func):
@@ -101,7 +103,7 @@ def qalib_interaction(
 
 
 def qalib_item_interaction(
-    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions
+    template_engine: TemplateEngine, filename: str, *renderer_options: RenderingOptions, **renderer_kwargs: Any
 ) -> Callable[[Callable[..., Coro[T]]], Callable[..., Coro[T]]]:
     """This decorator is used to create a QalibInteraction object, and pass it to the function as it's second argument
 
@@ -109,11 +111,12 @@ def qalib_item_interaction(
         template_engine (TemplateEngine): template engine that is used to template the document
         filename (str): filename of the document
         renderer_options (RenderingOptions): options for the renderer
+        **renderer_kwargs (Any): keyword arguments of the renderer, such as the executor that render_async offloads to
 
     Returns (Callable): decorated function that takes the Interaction object and using the extended
     QalibInteraction object
     """
-    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options)
+    renderer_instance: Renderer[str] = Renderer(template_engine, filename, *renderer_options, **renderer_kwargs)
 
     def command(func: Callable[..., Coro[T]]) -> Callable[..., Coro[T]]:
         @wraps(func)
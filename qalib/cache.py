@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import datetime
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Callable, Dict, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+
+Fingerprint = Callable[[Dict[str, Any]], Hashable]
+
+DEFAULT_CACHE_SIZE = 128
+DEFAULT_STALE_AFTER = 60.0
+VALUE_TYPES = frozenset(
+    {
+        type(None),
+        bool,
+        int,
+        float,
+        complex,
+        str,
+        bytes,
+        Decimal,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+    }
+)
+
+
+def freeze(value: Any) -> Hashable:
+    """Converts the value into a hashable value that is equal for equal values of the same type, by converting
+    dictionaries, lists and sets into their immutable counterparts. Only plain values, such as numbers, strings and
+    dates, can be frozen, as other objects may change while they are cached without their hash changing (discord.py
+    models hash and compare by their id). Every plain value is paired with the name of its type, so that values that
+    compare equal but render differently (such as 1, 1.0 and True) are told apart.
+
+    Args:
+        value (Any): value to convert
+
+    Returns (Hashable): the hashable value
+
+    Raises:
+        TypeError: if the value, or any value within it, is not a plain value or a container of them
+    """
+    if isinstance(value, dict):
+        return frozenset((freeze(key), freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if type(value) not in VALUE_TYPES:
+        raise TypeError(f"Values of type {type(value).__qualname__} can not be fingerprinted")
+    return type(value).__qualname__, value
+
+
+def default_fingerprint(keywords: Dict[str, Any]) -> Hashable:
+    """Fingerprints the keywords by their values, freezing any dictionaries, lists and sets within them. Keywords
+    that hold any other object, such as a discord.py model, can not be fingerprinted, so their renders skip the cache.
+    A custom fingerprint can be given to the renderer to cache them, along with a ttl if the objects can change.
+
+    Args:
+        keywords (Dict[str, Any]): keywords of the render
+
+    Returns (Hashable): fingerprint of the keywords
+
+    Raises:
+        TypeError: if any of the keywords can not be fingerprinted
+    """
+    return freeze(keywords)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a render cache, in the manner of functools.lru_cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class CacheEntry(NamedTuple):
+    """Templated document of a render, and the time at which it was templated."""
+
+    document: Any
+    created: float
+
+
+class RenderCache(Generic[K]):
+    """Least recently used cache of templated documents, keyed by the key of the element and the fingerprint of the
+    keywords. It stores the templated document rather than the deserialized message, so that every hit is deserialized
+    into fresh embeds and views that can be sent and mutated independently of each other.
+    """
+
+    __slots__ = "_maxsize", "_ttl", "_fingerprint", "_clock", "_entries", "_lock", "_hits", "_misses", "_evictions"
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = None,
+        fingerprint: Fingerprint = default_fingerprint,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialisation of the render cache
+
+        Args:
+            maxsize (int): maximum number of documents that are cached
+            ttl (Optional[float]): seconds that a document is cached for, forever if None
+            fingerprint (Fingerprint): function that converts the keywords into a hashable value, which raises a
+                TypeError for keywords that can not be cached
+            clock (Callable[[], float]): function that returns the current time in seconds
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._fingerprint = fingerprint
+        self._clock = clock
+        self._entries: OrderedDict[Tuple[K, Hashable], CacheEntry] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key(self, key: K, keywords: Dict[str, Any], version: Hashable = None) -> Optional[Tuple[K, Hashable]]:
+        """Computes the cache key of a render.
+
+        Args:
+            key (K): key of the element
+            keywords (Dict[str, Any]): keywords of the render
+            version (Hashable): version of the document that is rendered, such as the stamp of its file, so that the
+                documents templated from an older version are never served once the document changes
+
+        Returns (Optional[Tuple[K, Hashable]]): the cache key, or None if the keywords can not be fingerprinted
+        """
+        try:
+            entry = key, (version, self._fingerprint(keywords))
+            hash(entry)
+        except TypeError:
+            return None
+        return entry
+
+    def entry(self, key: Tuple[K, Hashable]) -> Optional[CacheEntry]:
+        """Retrieves the entry that is cached under the cache key, without counting it as a hit or a miss.
+
+        Args:
+            key (Tuple[K, Hashable]): cache key of the render
+
+        Returns (Optional[CacheEntry]): the entry, or None if there is no entry or it has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl is not None and self._clock() - entry.created >= self._ttl:
+                del self._entries[key]
+                return None
+            return entry
+
+    def lookup(self, key: Tuple[K, Hashable]) -> Optional[CacheEntry]:
+        """Retrieves the entry that is cached under the cache key, counts it as a hit or a miss, and marks it as
+        recently used.
+
+        Args:
+            key (Tuple[K, Hashable]): cache key of the render
+
+        Returns (Optional[CacheEntry]): the entry, or None if it is not cached
+        """
+        entry = self.entry(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get(self, key: Tuple[K, Hashable]) -> Optional[Any]:
+        """Retrieves the templated document that is cached under the cache key, and marks it as recently used.
+
+        Args:
+            key (Tuple[K, Hashable]): cache key of the render
+
+        Returns (Optional[Any]): the templated document, or None if it is not cached
+        """
+        entry = self.lookup(key)
+        return None if entry is None else entry.document
+
+    def put(self, key: Tuple[K, Hashable], document: Any) -> None:
+        """Caches the templated document under the cache key, evicting the least recently used document if the cache
+        is full.
+
+        Args:
+            key (Tuple[K, Hashable]): cache key of the render
+            document (Any): templated document
+        """
+        with self._lock:
+            self._entries[key] = CacheEntry(document, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def age(self, entry: CacheEntry) -> float:
+        """Computes the number of seconds since the document of the entry was templated.
+
+        Args:
+            entry (CacheEntry): entry of the cache
+
+        Returns (float): the age of the entry in seconds
+        """
+        return self._clock() - entry.created
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        """Removes the cached documents of the key, or every cached document if the key is None.
+
+        Args:
+            key (Optional[K]): key of the element
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                for entry in [entry for entry in self._entries if entry[0] == key]:
+                    del self._entries[entry]
+
+    def cache_info(self) -> CacheInfo:
+        """Retrieves the statistics of the cache.
+
+        Returns (CacheInfo): hits, misses, evictions, maximum size and current size of the cache
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Removes every cached document and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
@@ -64,6 +64,8 @@ class QalibContext(discord.ext.commands.context.Context, Generic[K_contra]):
         callables: Optional[Dict[str, Callback]] = None,
         keywords: Optional[Dict[str, Any]] = None,
         events: Optional[EventCallbacks] = None,
+        *,
+        offload: Optional[bool] = None,
         **kwargs,
     ) -> discord.message.Message:
         """Methods that is fires a message to the client and returns the message object. Doesn't save/keep track of the
@@ -74,11 +76,13 @@ class QalibContext(discord.ext.commands.context.Context, Generic[K_contra]):
             callables (Optional[Dict[str, Callback]]) : functions that are hooked to components
             keywords (Dict[str, Any]): keywords that are passed to the embed renderer to format the text
             events (Optional[EventCallback]): callbacks that are called on the event
+            offload (Optional[bool]): whether the element is templated in the executor of the renderer, decided by
+                the renderer if None
             **kwargs: kwargs that are passed to the context's send method
 
         Returns (discord.message.Message): Message object that got sent to the client.
         """
-        message = self._renderer.render(identifier, callables, keywords, events)
+        message = await self._renderer.render_async(identifier, callables, keywords, events, offload=offload)
 
         if isinstance(message, Menu):
             message.set_front_page(kwargs.get("page", 0))
@@ -93,6 +97,8 @@ class QalibContext(discord.ext.commands.context.Context, Generic[K_contra]):
         callables: Optional[Dict[str, Callback]] = None,
         keywords: Optional[Dict[str, Any]] = None,
         events: Optional[EventCallbacks] = None,
+        *,
+        offload: Optional[bool] = None,
         **kwargs,
     ) -> None:
         """this is the main function that we use to send one message, and one message only. However, edits to that
@@ -103,11 +109,13 @@ class QalibContext(discord.ext.commands.context.Context, Generic[K_contra]):
             callables (Optional[Dict[str, Callback]]): callable coroutines that are called when the user interacts
             keywords (Optional[Dict[str, Any]]: keywords that are passed to the embed renderer to format the text
             events (Optional[EventCallback]): callbacks that are called on the event
+            offload (Optional[bool]): whether the element is templated in the executor of the renderer, decided by
+                the renderer if None
             **kwargs: kwargs that are passed to the context send method or the message edit method
 
         Returns (discord.message.Message): Message object that got sent to the client.
         """
-        message = self._renderer.render(key, callables, keywords, events)
+        message = await self._renderer.render_async(key, callables, keywords, events, offload=offload)
         if isinstance(message, Menu):
             message.set_front_page(kwargs.get("page", 0))
             message = message.front
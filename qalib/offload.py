@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Dict, Generic, NamedTuple, Optional, TypeVar
+
+K = TypeVar("K")
+
+DEFAULT_LATENCY_THRESHOLD = 0.001
+DEFAULT_SMOOTHING = 0.2
+
+
+class CostEstimate(NamedTuple):
+    """Estimated cost of templating an element in seconds, over a number of samples, and whether the cost exceeds the
+    latency threshold (in which case ADAPTIVE renderers offload the element to an executor)."""
+
+    average: float
+    samples: int
+    expensive: bool
+
+
+class CostTracker(Generic[K]):
+    """Tracks the cost of templating every key as an exponential moving average, and decides whether a key is
+    expensive enough to be templated in an executor instead of on the event loop."""
+
+    __slots__ = "_latency_threshold", "_smoothing", "_estimates", "_lock"
+
+    def __init__(self, latency_threshold: float = DEFAULT_LATENCY_THRESHOLD, smoothing: float = DEFAULT_SMOOTHING):
+        """Initialisation of the cost tracker
+
+        Args:
+            latency_threshold (float): seconds that templating a key may take before it is offloaded
+            smoothing (float): weight of the latest sample in the moving average, between 0 and 1
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing must be between 0 and 1")
+        self._latency_threshold = latency_threshold
+        self._smoothing = smoothing
+        self._estimates: Dict[K, CostEstimate] = {}
+        self._lock = Lock()
+
+    @property
+    def latency_threshold(self) -> float:
+        return self._latency_threshold
+
+    @latency_threshold.setter
+    def latency_threshold(self, latency_threshold: float) -> None:
+        with self._lock:
+            self._latency_threshold = latency_threshold
+            self._estimates = {
+                key: estimate._replace(expensive=estimate.average > latency_threshold)
+                for key, estimate in self._estimates.items()
+            }
+
+    def record(self, key: K, seconds: float) -> None:
+        """Records the time that it took to template the key.
+
+        Args:
+            key (K): key of the element
+            seconds (float): time that it took to template the element
+        """
+        with self._lock:
+            estimate = self._estimates.get(key)
+            if estimate is None:
+                average, samples = seconds, 1
+            else:
+                average = estimate.average + self._smoothing * (seconds - estimate.average)
+                samples = estimate.samples + 1
+            self._estimates[key] = CostEstimate(average, samples, average > self._latency_threshold)
+
+    def estimate(self, key: K) -> Optional[CostEstimate]:
+        """Retrieves the estimated cost of templating the key.
+
+        Args:
+            key (K): key of the element
+
+        Returns (Optional[CostEstimate]): the estimate, or None if the key has not been templated yet
+        """
+        return self._estimates.get(key)
+
+    def estimates(self) -> Dict[K, CostEstimate]:
+        """Retrieves the estimated cost of templating every key that has been templated.
+
+        Returns (Dict[K, CostEstimate]): the estimates by key
+        """
+        with self._lock:
+            return dict(self._estimates)
+
+    def is_expensive(self, key: K) -> bool:
+        """Determines whether the key is expensive enough to be templated in an executor. Keys that have not been
+        templated yet are templated inline, so that their cost is measured.
+
+        Args:
+            key (K): key of the element
+
+        Returns (bool): True if the key is expensive
+        """
+        estimate = self._estimates.get(key)
+        return estimate is not None and estimate.expensive
+
+    def clear(self) -> None:
+        """Removes every estimate."""
+        with self._lock:
+            self._estimates.clear()
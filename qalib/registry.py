@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+from threading import Lock
+from typing import Dict, List, Tuple
+from weakref import WeakSet
+
+from qalib.translators.factory import TemplaterFactory
+from qalib.translators.source import FileSource, InMemorySource, Source, Stamp, stamp
+from qalib.translators.templater import Templater
+
+
+class Registry:
+    """Process-wide registry that interns the parsed documents and sources, so that every Renderer and decorator that
+    uses the same file shares a single copy of them. Parsed documents are parsed again once the modification time or
+    size of the file changes. It also keeps track of the renderers that are alive, so that they can be warmed up.
+    """
+
+    __slots__ = "_lock", "_templaters", "_sources", "_renderers"
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._templaters: Dict[Tuple[str, bool], Tuple[Stamp, Templater]] = {}
+        self._sources: Dict[Tuple[str, bool], Source] = {}
+        self._renderers: WeakSet[object] = WeakSet()
+
+    def templater(self, filename: str, *, parse_once: bool = False) -> Templater:
+        """Retrieves the templater of the file, parsing the file if it has not been parsed yet, or if it has changed
+        since it was parsed.
+
+        Args:
+            filename (str): path of the file
+            parse_once (bool): whether the templater parses the document once and templates its nodes
+
+        Returns (Templater): templater of the file
+        """
+        key = os.path.abspath(filename), parse_once
+        current = stamp(filename)
+        with self._lock:
+            entry = self._templaters.get(key)
+        if entry is not None and entry[0] == current:
+            return entry[1]
+        templater = TemplaterFactory.get_templater(filename, parse_once=parse_once)
+        with self._lock:
+            entry = self._templaters.get(key)
+            if entry is not None and entry[0] == current:
+                return entry[1]
+            self._templaters[key] = current, templater
+        return templater
+
+    def source(self, filename: str, *, in_memory: bool = False) -> Source:
+        """Retrieves the source of the file.
+
+        Args:
+            filename (str): path of the file
+            in_memory (bool): whether the contents of the file are kept in memory and never read again
+
+        Returns (Source): source of the file
+        """
+        key = os.path.abspath(filename), in_memory
+        with self._lock:
+            if (source := self._sources.get(key)) is None:
+                source = self._sources[key] = InMemorySource(filename) if in_memory else FileSource(filename)
+            return source
+
+    def register(self, renderer: object) -> None:
+        """Keeps track of the renderer for as long as it is alive, without sharing it with anyone else.
+
+        Args:
+            renderer (object): renderer that is registered
+        """
+        with self._lock:
+            self._renderers.add(renderer)
+
+    def renderers(self) -> List[object]:
+        """Retrieves every renderer that is registered and still alive.
+
+        Returns (List[object]): the registered renderers
+        """
+        with self._lock:
+            return list(self._renderers)
+
+    def clear(self) -> None:
+        """Removes everything from the registry."""
+        with self._lock:
+            self._templaters.clear()
+            self._sources.clear()
+            self._renderers.clear()
+
+
+registry = Registry()
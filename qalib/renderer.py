@@ -1,20 +1,89 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
+import os
+import time
 from enum import Enum, auto
-from typing import Any, Dict, Generic, Optional, cast
+from concurrent.futures import Executor
+from threading import Lock
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from qalib.template_engines.template_engine import TemplateEngine
 from qalib.translators import Callback
 from qalib.translators.events import EventCallbacks
 from qalib.translators.deserializer import ReturnType, K_contra, Deserializer
+from qalib.cache import DEFAULT_CACHE_SIZE, DEFAULT_STALE_AFTER, Fingerprint, RenderCache, default_fingerprint
+from qalib.offload import DEFAULT_LATENCY_THRESHOLD, CostTracker
+from qalib.registry import registry
 from qalib.translators.factory import DeserializerFactory, TemplaterFactory
+from qalib.translators.source import Source, Stamp, stamp
 from qalib.translators.templater import Templater
 
+_log = logging.getLogger(__name__)
+
+
+class _Verbatim(TemplateEngine):
+    """Template engine that leaves every document as it is, used to parse documents that have already been templated."""
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        return document
+
+    def is_static(self, document: str) -> bool:
+        return True
+
+
+_VERBATIM = _Verbatim()
+
 
 class RenderingOptions(Enum):
-    """Options for the renderer."""
+    """Options for the renderer.
+
+    PRE_TEMPLATE: templates the whole file before it is parsed, on every render. The contents of the file are cached,
+        and only read again once the modification time or size of the file changes.
+    PARSE_ONCE: parses XML documents once, and templates only the text and attribute values of their elements, which
+        means that template control flow can not be used to generate the markup.
+    IN_MEMORY: keeps the contents of the file in memory for PRE_TEMPLATE, so that the file is never read again.
+    SINGLE_PASS: hands the document templated by PRE_TEMPLATE straight to the deserializer, instead of templating its
+        elements a second time, so that keywords whose values contain template syntax are not expanded twice. It can
+        only be used along with PRE_TEMPLATE.
+    LAZY: defers reading and parsing the file until the first render, so that renderers cost nothing at startup.
+    OFFLOAD: templates the documents of every render_async in an executor, instead of on the event loop.
+    ADAPTIVE: templates the documents of render_async in an executor only for the keys whose moving average cost of
+        templating exceeds the latency threshold of the renderer, and inline for every other key. Only templating is
+        measured and offloaded: deserializing the document into embeds and views always runs on the event loop, as
+        discord.py views have to be created there, so menus and expansive messages that are expensive to deserialize
+        are not offloaded by it (they yield to the event loop between their pages instead).
+    CACHE: caches the templated documents by key and keywords, so that renders with the same keywords skip templating.
+        Every render still deserializes fresh embeds and views.
+    STALE_WHILE_REVALIDATE: caches the templated documents like CACHE, and once a cached document is older than the
+        staleness window of its key, returns it anyway and templates it again in the background with the keywords of
+        the render, replacing the cached document once the refresh finishes. Failed refreshes are logged and keep the
+        stale document, and are retried by a later render. Renders outside of an event loop treat stale documents as
+        misses.
+    """
 
     PRE_TEMPLATE = auto()
+    PARSE_ONCE = auto()
+    IN_MEMORY = auto()
+    SINGLE_PASS = auto()
+    LAZY = auto()
+    OFFLOAD = auto()
+    ADAPTIVE = auto()
+    CACHE = auto()
+    STALE_WHILE_REVALIDATE = auto()
 
 
 class Renderer(Generic[K_contra]):
@@ -22,15 +91,155 @@ class Renderer(Generic[K_contra]):
     template the document, and then using the deserializer to deserialize the document into embeds and views.
     """
 
-    __slots__ = "_template_engine", "_parser", "_filename", "_deserializer"
+    __slots__ = (
+        "_template_engine",
+        "_parser",
+        "_filename",
+        "_deserializer",
+        "_parse_once",
+        "_source",
+        "_pre_templated",
+        "_element_engine",
+        "_in_memory",
+        "_stamp",
+        "_lock",
+        "_executor",
+        "_offload",
+        "_offload_keys",
+        "_adaptive",
+        "_costs",
+        "_cache",
+        "_stale_after",
+        "_stale_after_keys",
+        "_revalidating",
+        "__weakref__",
+    )
 
-    def __init__(self, template_engine: TemplateEngine, filename: str, *rendering_options: RenderingOptions):
+    def __init__(
+        self,
+        template_engine: TemplateEngine,
+        filename: str,
+        *rendering_options: RenderingOptions,
+        executor: Optional[Executor] = None,
+        offload_keys: Iterable[K_contra] = (),
+        latency_threshold: float = DEFAULT_LATENCY_THRESHOLD,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: Optional[float] = None,
+        fingerprint: Fingerprint = default_fingerprint,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        stale_after_keys: Optional[Mapping[K_contra, float] | Iterable[Tuple[K_contra, float]]] = None,
+    ):
+        """Initialisation of the Renderer
+
+        Args:
+            template_engine (TemplateEngine): template engine that is used to template the document
+            filename (str): filename of the document
+            rendering_options (RenderingOptions): options for the renderer
+            executor (Optional[Executor]): executor that render_async offloads to, the default executor of the event
+                loop (a thread pool) if None
+            offload_keys (Iterable[K]): keys that are always offloaded by render_async
+            latency_threshold (float): seconds that templating a key may take on average before it is offloaded, when
+                the renderer is ADAPTIVE
+            cache_size (int): maximum number of templated documents that are cached, when the renderer has CACHE
+            cache_ttl (Optional[float]): seconds that templated documents are cached for, forever if None
+            fingerprint (Fingerprint): function that converts the keywords into a hashable value for the cache, which
+                raises a TypeError for keywords that are not cached
+            stale_after (float): seconds after which cached documents are revalidated, when the renderer has
+                STALE_WHILE_REVALIDATE
+            stale_after_keys (Optional[Mapping[K, float]]): seconds after which the cached documents of specific keys
+                are revalidated, which take precedence over stale_after
+
+        Raises:
+            ValueError: if SINGLE_PASS is given without PRE_TEMPLATE
+        """
+        if RenderingOptions.SINGLE_PASS in rendering_options and RenderingOptions.PRE_TEMPLATE not in rendering_options:
+            raise ValueError("SINGLE_PASS can only be used along with PRE_TEMPLATE")
         self._template_engine = template_engine
+        self._parse_once = RenderingOptions.PARSE_ONCE in rendering_options
         self._parser: Optional[Templater] = None
-        if RenderingOptions.PRE_TEMPLATE not in rendering_options:
-            self._parser = TemplaterFactory.get_templater(filename)
+        self._source: Optional[Source] = None
+        self._pre_templated: Optional[Tuple[str, Templater]] = None
+        self._element_engine: TemplateEngine = template_engine
+        self._in_memory: Optional[bool] = None
+        if RenderingOptions.PRE_TEMPLATE in rendering_options:
+            self._in_memory = RenderingOptions.IN_MEMORY in rendering_options
+            if RenderingOptions.SINGLE_PASS in rendering_options:
+                self._element_engine = _VERBATIM
         self._filename = filename
         self._deserializer = cast(Deserializer[K_contra], DeserializerFactory.get_deserializer(filename))
+        self._stamp: Optional[Stamp] = None
+        self._lock = Lock()
+        self._executor = executor
+        self._offload = RenderingOptions.OFFLOAD in rendering_options
+        self._offload_keys: FrozenSet[K_contra] = frozenset(offload_keys)
+        self._adaptive = RenderingOptions.ADAPTIVE in rendering_options
+        self._costs: CostTracker[K_contra] = CostTracker(latency_threshold)
+        self._cache: Optional[RenderCache[K_contra]] = None
+        self._stale_after: Optional[float] = None
+        self._stale_after_keys: Dict[K_contra, float] = {} if stale_after_keys is None else dict(stale_after_keys)
+        self._revalidating: Dict[Hashable, asyncio.Task[None]] = {}
+        if RenderingOptions.STALE_WHILE_REVALIDATE in rendering_options:
+            self._stale_after = stale_after
+        if RenderingOptions.CACHE in rendering_options or self._stale_after is not None:
+            self._cache = RenderCache(cache_size, cache_ttl, fingerprint)
+        registry.register(self)
+        if RenderingOptions.LAZY not in rendering_options:
+            self._load()
+
+    def _load(self) -> None:
+        """Loads the parsed document, or the source of the document for PRE_TEMPLATE, from the registry. The document
+        is only loaded once, even if multiple threads render concurrently, and the file is not checked again on every
+        render, as the parsed document is only loaded again by reload."""
+        if self._parser is not None or self._source is not None:
+            return
+        with self._lock:
+            if self._in_memory is not None:
+                if self._source is None:
+                    self._source = registry.source(self._filename, in_memory=self._in_memory)
+            elif self._parser is None:
+                self._stamp = stamp(self._filename)
+                self._parser = registry.templater(self._filename, parse_once=self._parse_once)
+
+    def reload(self) -> None:
+        """This method is used to load the parsed document again from the registry, if the modification time or size
+        of the file has changed since it was loaded. Documents that are templated before they are parsed are read again
+        whenever the file changes, unless they are kept in memory, so they do not have to be reloaded.
+        """
+        if self._in_memory is not None:
+            self._load()
+            return
+        current = stamp(self._filename)
+        with self._lock:
+            if current != self._stamp or self._parser is None:
+                self._parser = registry.templater(self._filename, parse_once=self._parse_once)
+                self._stamp = current
+
+    def _version(self) -> Optional[Stamp]:
+        """Loads the document and retrieves the version of the file that it is loaded from, which is part of the cache
+        key of every render. Only the files that are templated before they are parsed are checked on every render.
+
+        Returns (Optional[Stamp]): the stamp of the file, or None if its contents are kept in memory
+        """
+        self._load()
+        return self._stamp if self._source is None else self._source.stamp()
+
+    def preload(self) -> None:
+        """This method is used to load the document and prepare every element of it for the template engine ahead of
+        the first render, so that the first render does not pay the cost of parsing and compiling the document.
+        """
+        self._load()
+        if self._parser is not None:
+            self._parser.preload(self._template_engine)
+        else:
+            self._template_engine.compile(cast(Source, self._source).read())
+
+    @property
+    def filename(self) -> str:
+        """This property is used to get the filename of the document that is rendered.
+
+        Returns (str): filename of the document
+        """
+        return self._filename
 
     def _pre_template(self, keywords: Dict[str, Any]) -> Templater:
         """Pre-Template templates the document before further processing. It returns a Parser instance that contains
@@ -41,13 +250,15 @@ class Renderer(Generic[K_contra]):
 
         Returns (Parser): Parser instance that contains the data that is used to render the embeds and views.
         """
-        if self._parser is None:
-            with open(self._filename, "r", encoding="utf-8") as file:
-                return TemplaterFactory.get_templater(
-                    self._filename,
-                    source=self._template_engine.template(file.read(), keywords),
-                )
-        return self._parser
+        self._load()
+        if self._parser is not None:
+            return self._parser
+        source = self._template_engine.template(cast(Source, self._source).read(), keywords)
+        if (pre_templated := self._pre_templated) is not None and pre_templated[0] == source:
+            return pre_templated[1]
+        parser = TemplaterFactory.get_templater(self._filename, source=source, parse_once=self._parse_once)
+        self._pre_templated = source, parser
+        return parser
 
     def render(
         self,
@@ -75,5 +286,202 @@ class Renderer(Generic[K_contra]):
         if events is None:
             events = {}
 
-        source = self._pre_template(keywords).template(self._template_engine, keywords)
-        return self._deserializer.deserialize(source, key, callbacks, events)
+        document = self.template(key, keywords)
+        return self._deserializer.deserialize_document(document, key, callbacks, events)
+
+    def template(self, key: K_contra, keywords: Optional[Dict[str, Any]] = None) -> Any:
+        """This method is used to template the element identified by the key into the document that is handed to the
+        deserializer. It only works on data, so it can be run outside the event loop.
+
+        Args:
+            key (K): key of the element
+            keywords (Dict[str, Any]): keywords that are passed to the template engine to template the element
+
+        Returns (Any): the templated document
+        """
+        if keywords is None:
+            keywords = {}
+        entry, document = self._lookup(key, keywords)
+        if document is None:
+            document = self._template(key, keywords, entry)
+        return document
+
+    def _lookup(self, key: K_contra, keywords: Dict[str, Any]) -> Tuple[Optional[Hashable], Optional[Any]]:
+        """Looks up the templated document of the render in the cache.
+
+        Args:
+            key (K): key of the element
+            keywords (Dict[str, Any]): keywords of the render
+
+        Returns (Tuple[Optional[Hashable], Optional[Any]]): the cache key, which is None if the render is not cached,
+            and the cached document, which is None on a miss
+        """
+        if self._cache is None or (entry := self._cache.key(key, keywords, self._version())) is None:
+            return None, None
+        if self._stale_after is None:
+            return entry, self._cache.get(entry)
+        cached = self._cache.lookup(entry)
+        if cached is None:
+            return entry, None
+        if self._cache.age(cached) >= self.staleness(key) and not self._revalidate(key, keywords, entry):
+            return entry, None
+        return entry, cached.document
+
+    def staleness(self, key: K_contra) -> float:
+        """This method is used to get the number of seconds after which the cached documents of the key are
+        revalidated in the background.
+
+        Args:
+            key (K): key of the element
+
+        Returns (float): the staleness window of the key, infinite if the renderer does not revalidate
+        """
+        if self._stale_after is None:
+            return math.inf
+        return self._stale_after_keys.get(key, self._stale_after)
+
+    def _revalidate(self, key: K_contra, keywords: Dict[str, Any], entry: Hashable) -> bool:
+        """Templates the element again in the background, unless it is already being revalidated. The stale document is
+        kept if the refresh fails, and the error is logged, so that renders keep being served while a later render
+        retries the refresh.
+
+        Args:
+            key (K): key of the element
+            keywords (Dict[str, Any]): keywords of the render
+            entry (Hashable): cache key of the render
+
+        Returns (bool): True if the stale document can be served, False if there is no event loop to revalidate on
+        """
+        if entry in self._revalidating:
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        keywords = dict(keywords)
+
+        async def refresh() -> None:
+            if self.offloads(key):
+                await loop.run_in_executor(self._executor, self._template, key, keywords, entry)
+            else:
+                self._template(key, keywords, entry)
+
+        def done(task: asyncio.Task[None]) -> None:
+            del self._revalidating[entry]
+            if not task.cancelled() and (exception := task.exception()) is not None:
+                _log.error("Failed to revalidate the cached document of %r", key, exc_info=exception)
+
+        task = self._revalidating[entry] = loop.create_task(refresh())
+        task.add_done_callback(done)
+        return True
+
+    async def revalidated(self) -> None:
+        """This method is used to wait until every background refresh of STALE_WHILE_REVALIDATE has finished."""
+        while self._revalidating:
+            await asyncio.wait(list(self._revalidating.values()))
+
+    def _template(self, key: K_contra, keywords: Dict[str, Any], entry: Optional[Hashable] = None) -> Any:
+        """Templates the element, records the cost of templating it, and caches the templated document under the cache
+        key if there is one.
+
+        Args:
+            key (K): key of the element
+            keywords (Dict[str, Any]): keywords of the render
+            entry (Optional[Hashable]): cache key of the render
+
+        Returns (Any): the templated document
+        """
+        start = time.perf_counter()
+        document = self._pre_template(keywords).template_document(key, self._element_engine, keywords)
+        self._costs.record(key, time.perf_counter() - start)
+        if entry is not None:
+            cast(RenderCache[K_contra], self._cache).put(cast(Tuple[K_contra, Hashable], entry), document)
+        return document
+
+    def offloads(self, key: K_contra) -> bool:
+        """This method is used to determine whether render_async templates the element in the executor.
+
+        Args:
+            key (K): key of the element
+
+        Returns (bool): True if the element is offloaded
+        """
+        return self._offload or key in self._offload_keys or (self._adaptive and self._costs.is_expensive(key))
+
+    @property
+    def costs(self) -> CostTracker[K_contra]:
+        """This property is used to get the moving average cost of templating every key, which is tracked for every
+        render, and the offload decisions of ADAPTIVE renderers that are based on them.
+
+        Returns (CostTracker[K]): the cost tracker of the renderer
+        """
+        return self._costs
+
+    @property
+    def cache(self) -> Optional[RenderCache[K_contra]]:
+        """This property is used to get the cache of templated documents, which reports the hits and misses of the
+        renderer through its cache_info method.
+
+        Returns (Optional[RenderCache[K]]): the cache, or None if the renderer does not have CACHE
+        """
+        return self._cache
+
+    async def render_async(
+        self,
+        key: K_contra,
+        callbacks: Optional[Dict[str, Callback]] = None,
+        keywords: Optional[Dict[str, Any]] = None,
+        events: Optional[EventCallbacks] = None,
+        *,
+        offload: Optional[bool] = None,
+    ) -> ReturnType:
+        """This method is used to render an embed and a view without blocking the event loop. The element is templated
+        in the executor when it is offloaded, and then deserialized on the event loop, as discord.py views have to be
+        created on the event loop. Menus are deserialized cooperatively, yielding to the event loop between pages.
+
+        Args:
+            key (K): key of the embed,
+            callbacks (Optional[Dict[str, Callable]]): callbacks that are attached to the components of the view,
+            keywords (Dict[str, Any]): keywords that are passed to the embed renderer to format the text,
+            events (Optional[EventCallbacks]): callbacks that are called on events
+            offload (Optional[bool]): whether the element is templated in the executor, decided by the renderer if None
+
+        Returns (ReturnType): All possible deserialized types
+        """
+        if keywords is None:
+            keywords = {}
+        entry, document = self._lookup(key, keywords)
+        if document is None:
+            if offload is None:
+                offload = self.offloads(key)
+            if offload:
+                loop = asyncio.get_running_loop()
+                document = await loop.run_in_executor(self._executor, self._template, key, keywords, entry)
+            else:
+                document = self._template(key, keywords, entry)
+        return await self._deserializer.deserialize_document_async(
+            document, key, {} if callbacks is None else callbacks, {} if events is None else events
+        )
+
+
+def warmup(paths: Optional[Iterable[str]] = None) -> None:
+    """Preloads the renderers that are alive, such as the renderers of the decorated commands, so that the first render
+    after a deploy does not pay the cost of parsing and compiling the documents. Parsing and compiling are pure Python
+    and hold the GIL, so the documents are preloaded one after another; call it in an executor to keep the event loop
+    responsive while it runs.
+
+    Args:
+        paths (Optional[Iterable[str]]): paths of the documents that are preloaded, every registered renderer if None.
+            Documents without a registered renderer are parsed into the registry.
+    """
+    renderers = [renderer for renderer in registry.renderers() if isinstance(renderer, Renderer)]
+    if paths is None:
+        for renderer in renderers:
+            renderer.preload()
+        return
+    for path in dict.fromkeys(os.path.abspath(path) for path in paths):
+        matching = [renderer for renderer in renderers if os.path.abspath(renderer.filename) == path]
+        if not matching:
+            registry.templater(path)
+        for renderer in matching:
+            renderer.preload()
@@ -1,8 +1,19 @@
+from __future__ import annotations
+
+import re
 import string
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from qalib.template_engines.template_engine import TemplateEngine
 
+CACHE_SIZE = 4096
+CONVERSIONS = {"s": str, "r": repr, "a": ascii}
+FIELD_NAME = re.compile(r"([^.\[]*)((?:\.[^.\[]+|\[[^\]]+\])*)")
+ACCESSOR = re.compile(r"\.([^.\[]+)|\[([^\]]+)\]")
+
+Accessor = Tuple[bool, Union[int, str]]
+
 
 class FormatPlaceholder:
     def __init__(self, key):
@@ -29,6 +40,107 @@ class FormatDict(dict):
         return FormatPlaceholder(key)
 
 
+def split_field_name(field_name: str) -> Optional[Tuple[Union[int, str], List[Accessor]]]:
+    """Splits the field name of a replacement field into its first part and its accessors, in the same manner as
+    str.format, so that e.g. a.b[0] is split into a, and the attribute b and the index 0.
+
+    Args:
+        field_name (str): field name of the replacement field
+
+    Returns (Optional[Tuple[Union[int, str], List[Accessor]]]): the first part, which is an int for positional fields,
+        and the accessors as (is attribute, key) pairs, or None if the field name is malformed
+    """
+    match = FIELD_NAME.fullmatch(field_name)
+    if match is None:
+        return None
+    first, rest = match.groups()
+    accessors: List[Accessor] = [
+        (True, attr) if attr is not None else (False, int(index) if index.isdecimal() else index)
+        for attr, index in (accessor.groups() for accessor in ACCESSOR.finditer(rest))
+    ]
+    return int(first) if first.isdecimal() else first, accessors
+
+
+class _Field:
+    """Replacement field of a format string, with its accessors (e.g. a.b[0]) resolved ahead of time."""
+
+    __slots__ = "_first", "_accessors", "_conversion", "_spec", "_placeholder"
+
+    def __init__(self, first: str, accessors: List[Accessor], conversion: Optional[str], spec: str):
+        self._first = first
+        self._accessors = accessors
+        self._conversion = conversion
+        self._spec = spec
+        name = first + "".join(f".{key}" if is_attr else f"[{key}]" for is_attr, key in self._accessors)
+        self._placeholder = f"{{{name}{'!' + conversion if conversion else ''}{':' + spec if spec else ''}}}"
+
+    def render(self, keywords: Dict[str, Any]) -> str:
+        if self._first not in keywords:
+            return self._placeholder
+        value = keywords[self._first]
+        for is_attr, key in self._accessors:
+            value = getattr(value, str(key)) if is_attr else value[key]
+        if self._conversion is not None:
+            value = CONVERSIONS[self._conversion](value)
+        return format(value, self._spec)
+
+
+class CompiledFormat:
+    """Format string that has been parsed once into its literal text and replacement fields, so that it can be rendered
+    with a single join. Format strings that use features that are not compiled (positional fields, malformed field
+    names, or replacement fields nested in the format spec) are rendered using string.Formatter instead.
+    """
+
+    __slots__ = "_document", "_segments", "_fallback"
+
+    def __init__(self, document: str):
+        self._document = document
+        self._segments: List[Union[str, _Field]] = []
+        self._fallback = False
+        for literal, field_name, spec, conversion in string.Formatter().parse(document):
+            if literal:
+                self._segments.append(literal)
+            if field_name is None:
+                continue
+            split = split_field_name(field_name)
+            if (
+                split is None
+                or not isinstance(split[0], str)
+                or split[0] == ""
+                or "{" in (spec or "")
+                or (conversion is not None and conversion not in CONVERSIONS)
+            ):
+                self._fallback = True
+                return
+            self._segments.append(_Field(split[0], split[1], conversion, spec or ""))
+
+    def render(self, keywords: Dict[str, Any]) -> str:
+        """Renders the format string using the keywords, leaving the replacement fields of missing keys intact.
+
+        Args:
+            keywords (Dict[str, Any]): keywords that are used to format the string
+
+        Returns (str): formatted string
+        """
+        if self._fallback:
+            return string.Formatter().vformat(self._document, (), FormatDict(keywords))
+        return "".join(
+            segment if isinstance(segment, str) else segment.render(keywords) for segment in self._segments
+        )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_format(document: str) -> CompiledFormat:
+    """Compiles the format string, caching the result so that every format string is only parsed once.
+
+    Args:
+        document (str): format string that is compiled
+
+    Returns (CompiledFormat): the compiled format string
+    """
+    return CompiledFormat(document)
+
+
 class Formatter(TemplateEngine):
     def template(self, document: str, keywords: Dict[str, Any]) -> str:
         """This method is used to format a string using the format method.
@@ -39,5 +151,22 @@ class Formatter(TemplateEngine):
 
         Returns (str): formatted string
         """
-        formatter = string.Formatter()
-        return formatter.vformat(document, (), FormatDict(keywords))
+        return compile_format(document).render(keywords)
+
+    def compile(self, document: str) -> None:
+        """This method is used to parse the format string into its compiled form ahead of time.
+
+        Parameters:
+            document (str): string that is compiled
+        """
+        compile_format(document)
+
+    def is_static(self, document: str) -> bool:
+        """This method is used to determine whether a string contains no replacement fields or escaped braces.
+
+        Parameters:
+            document (str): string that is checked
+
+        Returns (bool): True if the string is static
+        """
+        return "{" not in document and "}" not in document
@@ -1,13 +1,139 @@
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, NamedTuple, Optional
 
-from jinja2 import BaseLoader, Environment
+from jinja2 import BaseLoader, Environment, Template
 
 from qalib.template_engines.template_engine import TemplateEngine
 
+DEFAULT_CACHE_SIZE = 256
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TemplateCache:
+    """Least recently used cache of the templates compiled by an Environment, keyed by their source text. The size of
+    a cache that was configured is never grown past by reserve, while the default size grows to fit reserved templates.
+    """
+
+    __slots__ = "_environment", "_templates", "_maxsize", "_configured", "_hits", "_misses", "_lock"
+
+    def __init__(self, environment: Environment, maxsize: Optional[int] = None):
+        self._environment = environment
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+        self._maxsize = DEFAULT_CACHE_SIZE if maxsize is None else maxsize
+        self._configured = maxsize is not None
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._configured = True
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._templates) > max(self._maxsize, 0):
+            self._templates.popitem(last=False)
+
+    def reserve(self, count: int) -> None:
+        """Grows the cache so that the given number of templates fit next to the templates that it already holds,
+        without evicting any of them, unless its size was configured, which is never grown past. The cache never
+        shrinks.
+
+        Args:
+            count (int): number of templates that are about to be added
+        """
+        with self._lock:
+            if not self._configured:
+                self._maxsize = max(self._maxsize, len(self._templates) + count)
+
+    def get(self, source: str) -> Template:
+        """Retrieves the compiled template of the source, compiling it if it is not in the cache.
+
+        Args:
+            source (str): source text of the template
+
+        Returns (Template): the compiled template
+        """
+        with self._lock:
+            template = self._templates.get(source)
+            if template is not None:
+                self._hits += 1
+                self._templates.move_to_end(source)
+                return template
+            self._misses += 1
+
+        template = self._environment.from_string(source)
+        with self._lock:
+            self._templates[source] = template
+            self._evict()
+        return template
+
+    def info(self) -> CacheInfo:
+        """Retrieves the statistics of the cache.
+
+        Returns (CacheInfo): the hits, misses, maximum size and current size of the cache
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._templates))
+
+    def clear(self) -> None:
+        """Removes all the compiled templates from the cache, and resets its statistics."""
+        with self._lock:
+            self._templates.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_CACHE_ATTRIBUTE = "qalib_template_cache"
+_cache_lock = Lock()
+
+
+def get_template_cache(environment: Environment, maxsize: Optional[int] = None) -> TemplateCache:
+    """Retrieves the template cache that is shared by every Jinja2 template engine using the environment. The cache is
+    stored on the environment itself, so that it is released along with the environment.
+
+    Args:
+        environment (Environment): environment that compiles the templates
+        maxsize (Optional[int]): maximum number of compiled templates to keep, keeps the current size if None
+
+    Returns (TemplateCache): the template cache of the environment
+    """
+    with _cache_lock:
+        cache: Optional[TemplateCache] = getattr(environment, _CACHE_ATTRIBUTE, None)
+        if cache is None:
+            cache = TemplateCache(environment, maxsize)
+            setattr(environment, _CACHE_ATTRIBUTE, cache)
+            return cache
+    if maxsize is not None:
+        cache.maxsize = maxsize
+    return cache
+
 
 class Jinja2(TemplateEngine):
-    def __init__(self, environment: Optional[Environment] = None):
+    def __init__(self, environment: Optional[Environment] = None, cache_size: Optional[int] = None):
+        """Initialisation of the Jinja2 template engine.
+
+        Args:
+            environment (Optional[Environment]): environment that is used to compile the templates
+            cache_size (Optional[int]): maximum number of compiled templates that are cached for the environment,
+                which preloading never grows past. If None, the cache holds 256 templates, or every preloaded template
+                if there are more of them
+        """
         self._environment = environment or Environment(loader=BaseLoader(), autoescape=True)
+        self._cache = get_template_cache(self._environment, cache_size)
 
     @property
     def environment(self) -> Environment:
@@ -17,6 +143,70 @@ class Jinja2(TemplateEngine):
         """
         return self._environment
 
+    @property
+    def cache(self) -> TemplateCache:
+        """This property is used to get the cache of compiled templates, which is shared with every Jinja2 template
+        engine that uses the same environment.
+
+        Returns (TemplateCache): cache of the compiled templates
+        """
+        return self._cache
+
+    def cache_info(self) -> CacheInfo:
+        """This method is used to get the statistics of the cache of compiled templates.
+
+        Returns (CacheInfo): the hits, misses, maximum size and current size of the cache
+        """
+        return self._cache.info()
+
+    def compile(self, document: str) -> None:
+        """This method is used to compile the template ahead of time, and store it in the cache of the environment.
+
+        Parameters:
+            document (str): string that is compiled
+        """
+        self._cache.get(document)
+
+    def reserve(self, count: int) -> None:
+        """This method is used to grow the cache of compiled templates of the environment, so that the given number of
+        templates that are compiled ahead of time are not evicted before they are first used. Caches whose size was
+        configured are not grown.
+
+        Parameters:
+            count (int): number of templates that are about to be compiled
+        """
+        self._cache.reserve(count)
+
+    def is_static(self, document: str) -> bool:
+        """This method is used to determine whether a string contains none of the delimiters of the environment, and
+        none of the newlines that the environment would rewrite (i.e. trailing newlines and carriage returns).
+
+        Parameters:
+            document (str): string that is checked
+
+        Returns (bool): True if the string is static
+        """
+        if "\r" in document:
+            return False
+        if document.endswith("\n") and not self._environment.keep_trailing_newline:
+            return False
+        delimiters = (
+            self._environment.block_start_string,
+            self._environment.variable_start_string,
+            self._environment.comment_start_string,
+            self._environment.line_statement_prefix,
+            self._environment.line_comment_prefix,
+        )
+        return not any(delimiter in document for delimiter in delimiters if delimiter)
+
+    def syntax_key(self) -> Hashable:
+        """This method is used to identify the template syntax of the engine, which is defined by its environment, so
+        that every Jinja2 template engine that uses the same environment shares the analysis of the documents.
+
+        Returns (Hashable): environment of the template engine
+        """
+        return self._environment
+
     def template(self, document: str, keywords: Dict[str, Any]) -> str:
         """This method is used to format a string using the format method.
 
@@ -26,4 +216,4 @@ class Jinja2(TemplateEngine):
 
         Returns (str): formatted string
         """
-        return self._environment.from_string(document).render(**keywords)
+        return self._cache.get(document).render(**keywords)
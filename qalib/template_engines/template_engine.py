@@ -1,4 +1,4 @@
-from typing import Any, Dict, Protocol
+from typing import Any, Dict, Hashable, Protocol
 
 
 class TemplateEngine(Protocol):
@@ -12,3 +12,41 @@ class TemplateEngine(Protocol):
         Returns (str): templated string
         """
         raise NotImplementedError
+
+    def compile(self, document: str) -> None:
+        """Method that is used to compile a string ahead of time, so that the first time that it is templated does not
+        pay the cost of compiling it. Template engines that do not compile their strings do nothing.
+
+        Args:
+            document (str): string that is compiled
+        """
+
+    def reserve(self, count: int) -> None:
+        """Method that is used to make room for the given number of strings that are about to be compiled ahead of
+        time, so that they are not evicted from a bounded cache of compiled strings before they are first used.
+        Template engines that do not bound their compiled strings do nothing.
+
+        Args:
+            count (int): number of strings that are about to be compiled
+        """
+
+    def is_static(self, document: str) -> bool:
+        """Method that is used to determine whether a string contains no template syntax, and therefore templates to
+        itself for any keywords, so that it does not have to be sent through the template engine.
+
+        Args:
+            document (str): string that is checked
+
+        Returns (bool): True if the string is static, False if it may need to be templated
+        """
+        return False
+
+    def syntax_key(self) -> Hashable:
+        """Method that is used to identify the template syntax of the engine, so that every template engine with the
+        same syntax shares the analysis of which strings of a document are static, instead of every instance of the
+        engine analysing the document again. Template engines whose syntax depends on their configuration return an
+        object that identifies that configuration, which has to be weakly referenceable to be shared.
+
+        Returns (Hashable): identity of the template syntax, the type of the template engine by default
+        """
+        return type(self)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Dict, Protocol, Optional, Literal, TypeVar, Union
+from typing import Any, Dict, Protocol, Optional, Literal, TypeVar, Union
 
 from discord.ui import Modal
 
@@ -50,3 +50,38 @@ class Deserializer(Protocol[K_contra]):
         Returns (ReturnType): All possible deserialized types
         """
         raise NotImplementedError
+
+    def deserialize_document(
+        self, document: Any, key: K_contra, callables: Dict[str, Callback], events: EventCallbacks
+    ) -> ReturnType:
+        """This method is used to deserialize a document that has already been parsed by the templater (see
+        Templater.template_document). Documents that are given as a string are deserialized using deserialize.
+
+        Parameters:
+            document (Any): parsed document, or the source of the document in the form of string
+            key (K_contra): key that is used to deserialize the document
+            callables (Dict[str, Callback]): callables that are used to deserialize the document
+            events (EventCallbacks): hooks that are called on events
+
+        Returns (ReturnType): All possible deserialized types
+        """
+        if isinstance(document, str):
+            return self.deserialize(document, key, callables, events)
+        raise TypeError(f"Unsupported document type: {type(document).__name__}")
+
+    async def deserialize_document_async(
+        self, document: Any, key: K_contra, callables: Dict[str, Callback], events: EventCallbacks
+    ) -> ReturnType:
+        """This method is used to deserialize a document on the event loop, while yielding to the event loop while
+        menus are built, so that large menus do not block other tasks. Deserializers that do not build menus
+        cooperatively deserialize the document in one go.
+
+        Parameters:
+            document (Any): parsed document, or the source of the document in the form of string
+            key (K_contra): key that is used to deserialize the document
+            callables (Dict[str, Callback]): callables that are used to deserialize the document
+            events (EventCallbacks): hooks that are called on events
+
+        Returns (ReturnType): All possible deserialized types
+        """
+        return self.deserialize_document(document, key, callables, events)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import wraps
+from functools import partial, wraps
 from typing import List, Optional, Callable, TypeVar
 
 import discord
@@ -8,7 +8,7 @@ import discord
 from qalib.translators.element.embed import EmbedData, render
 from qalib.translators.element.types.embed import Field, EmbedBaseAdapter, Footer
 
-__all__ = "ExpansiveEmbedAdapter", "expand"
+__all__ = "ExpansiveEmbedAdapter", "expand", "expand_lazily"
 
 MAX_FIELD_LENGTH = 1_024
 
@@ -107,6 +107,37 @@ def replace(page_key: str, value: str, page: int) -> str:
     return value.replace(page_key, str(page))
 
 
+def _render_page(embed: ExpansiveEmbedAdapter, page: int, field: Field) -> discord.Embed:
+    return render(
+        EmbedData(
+            title=replace(embed.page_number_key, embed.title, page + 1),
+            colour=embed.colour,
+            type=embed.type,
+            description=replace(embed.page_number_key, embed.description, page + 1) if embed.description else None,
+            timestamp=embed.timestamp,
+            fields=[field],
+            footer=_replace_footer_with_page_key(embed.page_number_key, embed.footer, page + 1),
+            thumbnail=embed.thumbnail,
+            image=embed.image,
+            author=embed.author,
+        )
+    )
+
+
+def expand_lazily(embed: ExpansiveEmbedAdapter) -> List[Callable[[], discord.Embed]]:
+    """Splits the desired templated embed into pages, which are only rendered into discord.Embed instances once they
+    are called.
+
+    Args:
+        embed (ExpansiveEmbedAdapter): The embed proxy to render.
+
+    Returns:
+        List[Callable[[], discord.Embed]]: Functions that render the pages of the embed.
+    """
+    fields = _split_field(embed.field, embed.page_number_key)
+    return [partial(_render_page, embed, page, field) for page, field in enumerate(fields)]
+
+
 def expand(embed: ExpansiveEmbedAdapter) -> List[discord.Embed]:
     """Render the desired templated embed in discord.Embed instance.
 
@@ -117,20 +148,4 @@ def expand(embed: ExpansiveEmbedAdapter) -> List[discord.Embed]:
         Embed: Embed Object, discord compatible.
     """
 
-    return [
-        render(
-            EmbedData(
-                title=replace(embed.page_number_key, embed.title, page + 1),
-                colour=embed.colour,
-                type=embed.type,
-                description=replace(embed.page_number_key, embed.description, page + 1) if embed.description else None,
-                timestamp=embed.timestamp,
-                fields=[field],
-                footer=_replace_footer_with_page_key(embed.page_number_key, embed.footer, page + 1),
-                thumbnail=embed.thumbnail,
-                image=embed.image,
-                author=embed.author,
-            )
-        )
-        for page, field in enumerate(_split_field(embed.field, embed.page_number_key))
-    ]
+    return [page() for page in expand_lazily(embed)]
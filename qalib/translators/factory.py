@@ -3,7 +3,7 @@ from typing import Optional, Type, cast, Literal, Dict
 from .deserializer import Deserializer
 from .json import JSONDeserializer, JSONTemplater
 from .templater import Templater
-from .xml import XMLDeserializer, XMLTemplater
+from .xml import XMLDeserializer, XMLTemplater, XMLTreeTemplater
 
 Extensions = Literal[".xml", ".json"]
 
@@ -12,34 +12,38 @@ class TemplaterFactory:
     """Factory class for creating Parsers"""
 
     parsers: Dict[Extensions, Type[Templater]] = {".xml": XMLTemplater, ".json": JSONTemplater}
+    tree_parsers: Dict[Extensions, Type[Templater]] = {".xml": XMLTreeTemplater, ".json": JSONTemplater}
 
     @staticmethod
-    def get_templater_type(path: str) -> Type[Templater]:
+    def get_templater_type(path: str, *, parse_once: bool = False) -> Type[Templater]:
         """Returns the parser type based on the file extension of the path.
 
         Args:
             path (str): path of the file that is parsed
+            parse_once (bool): whether the parser should parse the document once and template its nodes
 
         Returns (Type[Parser]): parser type that is used to parse the file
         """
-        for extension, parser_type in TemplaterFactory.parsers.items():
+        parsers = TemplaterFactory.tree_parsers if parse_once else TemplaterFactory.parsers
+        for extension, parser_type in parsers.items():
             if path.endswith(extension):
                 return cast(Type[Templater], parser_type)
 
         raise ValueError("No parser found for the given file")
 
     @staticmethod
-    def get_templater(path: str, *, source: Optional[str] = None) -> Templater:
+    def get_templater(path: str, *, source: Optional[str] = None, parse_once: bool = False) -> Templater:
         """Returns an instantiated Parser based on the file extension of the path using either the source contents or
         the path.
 
         Args:
             path (str): path of the file that is parsed
             source (Optional[str]): source contents that are parsed
+            parse_once (bool): whether the parser should parse the document once and template its nodes
 
         Returns (Parser): parser that is used to parse the file
         """
-        parser = TemplaterFactory.get_templater_type(path)
+        parser = TemplaterFactory.get_templater_type(path, parse_once=parse_once)
         if source is not None:
             return parser(source=source)
         with open(path, encoding="utf8", mode="r") as file:
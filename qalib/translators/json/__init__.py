@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from copy import deepcopy
 from functools import partial
-from typing import List, Union, Dict, Optional, Any, cast, Callable, Type
+from typing import List, Union, Dict, Optional, Any, AsyncIterator, cast, Callable, Type, Set, Tuple
 
 import discord
 from discord import ui
@@ -18,7 +18,7 @@ from qalib.translators.deserializer import (
     ElementTypes,
 )
 from qalib.translators.element.embed import render
-from qalib.translators.element.expansive import expand
+from qalib.translators.element.expansive import expand_lazily
 from qalib.translators.events import EventCallbacks
 from qalib.translators.json.components import (
     ComponentTypes,
@@ -43,7 +43,7 @@ from qalib.translators.json.components import (
     Document,
 )
 from qalib.translators.json.embed import JSONEmbedAdapter, JSONExpansiveEmbedAdapter
-from qalib.translators.menu import Menu, MenuActions
+from qalib.translators.menu import Menu, MenuActions, MenuOptions, PageThunk
 from qalib.translators.message_parsing import (
     ButtonComponent,
     apply,
@@ -59,14 +59,41 @@ from qalib.translators.message_parsing import (
     pipe,
 )
 from qalib.translators.modal import QalibModal, ModalEvents, ModalEventsCallbacks
-from qalib.translators.templater import Templater
+from qalib.translators.templater import EngineCache, Templater, report_duplicate_key
 from qalib.translators.view import QalibView
 
 
+def load_document(source: str) -> Any:
+    """Loads the JSON document, and reports duplicate element keys at the top level of the document with a warning
+    instead of silently keeping the last element, which is still the element that is kept. Objects nested within the
+    elements are loaded as json.loads would.
+
+    Args:
+        source (str): source text of the document
+
+    Returns (Any): the loaded document
+    """
+    members: List[List[Tuple[str, Any]]] = []
+
+    def object_pairs_hook(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        members[:] = [pairs]
+        return dict(pairs)
+
+    document = json.loads(source, object_pairs_hook=object_pairs_hook)
+    # the hook is called for the innermost objects first, so the members of the top level object are the last ones
+    if isinstance(document, dict):
+        keys: Set[str] = set()
+        for key, _ in members[0]:
+            if key in keys:
+                report_duplicate_key(key)
+            keys.add(key)
+    return document
+
+
 class JSONTemplater(Templater):
     """This method is used to parse the document into a menu and a list of callables for .json files"""
 
-    __slots__ = ("_data",)
+    __slots__ = "_data", "_static_nodes"
 
     def __init__(self, source: str):
         """This method is used to initialize the parser by parsing the source text.
@@ -74,7 +101,101 @@ class JSONTemplater(Templater):
         Args:
             source (str): source text that is parsed
         """
-        self._data = json.loads(source)
+        self._data = load_document(source)
+        self._static_nodes: EngineCache[Set[int]] = EngineCache(self._find_static_nodes)
+
+    def _find_static_nodes(self, template_engine: TemplateEngine) -> Set[int]:
+        """Method that is used to find the nodes of the document that contain no template syntax for the template
+        engine, so that they are never sent through it.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is analysed for
+
+        Returns (Set[int]): identities of the static nodes
+        """
+        nodes: Set[int] = set()
+
+        def visit(obj: Any) -> bool:
+            if isinstance(obj, dict):
+                static = all([visit(value) for value in obj.values()])
+            elif isinstance(obj, list):
+                static = all([visit(value) for value in obj])
+            elif isinstance(obj, str):
+                static = template_engine.is_static(obj)
+            else:
+                static = True
+            if static:
+                nodes.add(id(obj))
+            return static
+
+        visit(self._data)
+        return nodes
+
+    def _template_node(
+        self, obj: OBJ, template_engine: TemplateEngine, keywords: Dict[str, Any], static_nodes: Set[int]
+    ) -> OBJ:
+        """Method that is used to template the object copy-on-write, so that new containers are only built along the
+        paths to strings that changed, and every other branch is shared with the parsed document. Static nodes are
+        never sent through the template engine.
+
+        Args:
+            obj (Dict | List | str | Any): object that is templated
+            template_engine (TemplateEngine): template engine that is used to template the object
+            keywords (Dict[str, Any]): keywords that are used to template the object
+            static_nodes (Set[int]): identities of the nodes that contain no template syntax
+
+        Returns (Dict[str, Any]): templated object, which is the object itself if nothing changed
+        """
+        if id(obj) in static_nodes:
+            return obj
+        if isinstance(obj, dict):
+            changed: Optional[Dict[str, Any]] = None
+            for key, value in obj.items():
+                templated = self._template_node(value, template_engine, keywords, static_nodes)
+                if templated is not value:
+                    if changed is None:
+                        changed = obj.copy()
+                    changed[key] = templated
+            return obj if changed is None else cast(OBJ, changed)
+        if isinstance(obj, list):
+            items: Optional[List[Any]] = None
+            for i, value in enumerate(obj):
+                templated = self._template_node(value, template_engine, keywords, static_nodes)
+                if templated is not value:
+                    if items is None:
+                        items = obj.copy()
+                    items[i] = templated
+            return obj if items is None else cast(OBJ, items)
+        if isinstance(obj, str):
+            text = template_engine.template(obj, keywords)
+            return obj if text == obj else cast(OBJ, text)
+        return obj
+
+    def preload(self, template_engine: TemplateEngine) -> None:
+        """This method is used to find the static nodes of the document, and compile every other string of it ahead of
+        the first render.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is prepared for
+        """
+        static_nodes = self._static_nodes.get(template_engine)
+        documents: Dict[str, None] = {}
+
+        def visit(obj: Any) -> None:
+            if id(obj) in static_nodes:
+                return
+            if isinstance(obj, dict):
+                obj = list(obj.values())
+            if isinstance(obj, list):
+                for value in obj:
+                    visit(value)
+            elif isinstance(obj, str):
+                documents[obj] = None
+
+        visit(self._data)
+        template_engine.reserve(len(documents))
+        for document in documents:
+            template_engine.compile(document)
 
     def recursive_template(self, obj: OBJ, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> OBJ:
         """Method that is used to recursively template the object using the templater and the keywords.
@@ -107,7 +228,55 @@ class JSONTemplater(Templater):
 
         Returns (str): templated element in the form of string.
         """
-        return json.dumps(self.recursive_template(deepcopy(self._data), template_engine, keywords))
+        static_nodes = self._static_nodes.get(template_engine)
+        return json.dumps(self._template_node(self._data, template_engine, keywords, static_nodes))
+
+    def _scope(self, key: str) -> Document:
+        """Method that is used to retrieve the element identified by the key, along with the pages that it references.
+        Pages that are referenced by a key that is not the literal key of an element, such as a templated key, can only
+        be found once the whole document is templated, so the whole document is retrieved for them.
+
+        Args:
+            key (str): key of the element
+
+        Returns (Document): document containing only the element and its referenced pages
+        """
+        element: Elements = self._data[key]
+        scoped: Document = {key: element}
+        if ElementTypes.from_str(element["type"]) == ElementTypes.MENU:
+            for page in cast(MenuMessage, element)["pages"]:
+                if isinstance(page, str):
+                    if page not in self._data:
+                        return self._data
+                    scoped[page] = self._data[page]
+        return scoped
+
+    def template_key(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (str): templated document containing the element in the form of string.
+        """
+        return json.dumps(self.template_document(key, template_engine, keywords))
+
+    def template_document(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> Document:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references, and hand it over to the deserializer without serializing it.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (Document): templated document containing the element, which shares its unchanged branches with the
+        parsed document, and must therefore not be mutated.
+        """
+        return self._template_node(self._scope(key), template_engine, keywords, self._static_nodes.get(template_engine))
 
 
 class JSONDeserializer(Deserializer[K_contra]):
@@ -128,8 +297,53 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (ReturnType): All possible deserialized objects.
         """
-        document: Document = json.loads(source)
+        return self.deserialize_document(json.loads(source), key, callables, events)
+
+    def deserialize_document(
+        self,
+        document: Union[str, Document],
+        key: K_contra,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> ReturnType:
+        """Method to deserialize a document that has already been parsed into a Display object
+
+        Args:
+            document (Document | str): The parsed document, or its source text
+            key (K): The key of the element to deserialize
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+
+        Returns (ReturnType): All possible deserialized objects.
+        """
+        if isinstance(document, str):
+            return self.deserialize(document, key, callables, events)
+        element: Elements = document[key]
+        return self.deserialize_element(document, element, callables, events)
+
+    async def deserialize_document_async(
+        self,
+        document: Union[str, Document],
+        key: K_contra,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> ReturnType:
+        """Method to deserialize a document into a Display object, building menus cooperatively so that the event loop
+        is yielded to between their pages.
+
+        Args:
+            document (Document | str): The parsed document, or its source text
+            key (K): The key of the element to deserialize
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+
+        Returns (ReturnType): All possible deserialized objects.
+        """
+        if isinstance(document, str):
+            document = cast(Document, json.loads(document))
         element: Elements = document[key]
+        if ElementTypes.from_str(element["type"]) == ElementTypes.MENU:
+            return await self.deserialize_menu_async(cast(MenuMessage, element), callables, events, document=document)
         return self.deserialize_element(document, element, callables, events)
 
     def deserialize_element(
@@ -244,13 +458,23 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (Menu): A Menu object
         """
-        pages = self.deserialize_expansive(message_tree, callbacks, events)
-        timeout = message_tree.get("timeout", 180.0)
-        if "arrows" not in message_tree:
-            return Menu(pages, timeout, events=events)
+        pages = self.deserialize_expansive_lazily(message_tree, callbacks, events)
+        return Menu(pages, events=events, **self._deserialize_menu_options(message_tree))
 
-        arrows: Dict[MenuActions, ButtonComponent] = self._deserialize_menu_arrows(message_tree["arrows"])
-        return Menu(pages, timeout, arrows, events)
+    @classmethod
+    def _deserialize_menu_options(cls, menu: Union[MenuMessage, ExpansiveMessage]) -> MenuOptions:
+        """Method to deserialize the options of a menu, which are shared by every way of building the menu
+
+        Args:
+            menu (Union[MenuMessage, ExpansiveMessage]): The menu or expansive message
+
+        Returns (MenuOptions): The timeout, arrows and single_view option of the menu
+        """
+        return {
+            "timeout": menu.get("timeout", 180.0),
+            "arrows": cls._deserialize_menu_arrows(menu["arrows"]) if "arrows" in menu else None,
+            "single_view": menu.get("single_view", False),
+        }
 
     @staticmethod
     def _deserialize_menu_arrows(arrows: Arrows) -> Dict[MenuActions, ButtonComponent]:
@@ -281,11 +505,39 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (List[Display]): A list of Display objects
         """
+        return [page() for page in self.deserialize_expansive_lazily(message_tree, callbacks, events)]
+
+    def deserialize_expansive_lazily(
+        self,
+        message_tree: ExpansiveMessage,
+        callbacks: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> List[PageThunk]:
+        """Method to split an expansive message into pages, which are only deserialized once they are called
+
+        Args:
+            message_tree (ExpansiveMessage): The ExpansiveMessage of the message_tree
+            callbacks (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+
+        Returns (List[PageThunk]): A list of functions that deserialize the pages
+        """
         return [
-            self.deserialize_message(message_tree, callbacks, events=events, embed=e)
-            for e in expand(JSONExpansiveEmbedAdapter(message_tree["embed"], message_tree.get("page_number_key")))
+            partial(self._deserialize_expansive_page, message_tree, callbacks, events, embed)
+            for embed in expand_lazily(
+                JSONExpansiveEmbedAdapter(message_tree["embed"], message_tree.get("page_number_key"))
+            )
         ]
 
+    def _deserialize_expansive_page(
+        self,
+        message_tree: ExpansiveMessage,
+        callbacks: Dict[str, Callback],
+        events: EventCallbacks,
+        embed: Callable[[], discord.Embed],
+    ) -> Message:
+        return self.deserialize_message(message_tree, callbacks, events=events, embed=embed())
+
     def deserialize_page(
         self,
         document: Document,
@@ -303,19 +555,33 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (List[Message]): List of pages
         """
+        return [page() for page in self.deserialize_page_lazily(document, raw_page, callables, events)]
+
+    def deserialize_page_lazily(
+        self,
+        document: Document,
+        raw_page: Union[str, Page],
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> List[PageThunk]:
+        """Method to split a page into the pages of a menu, which are only deserialized once they are called
+
+        Args:
+            document (Document): the original document containing all the keys.
+            raw_page (Page): The page to deserialize
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+
+        Returns (List[PageThunk]): List of functions that deserialize the pages
+        """
         page = document[raw_page] if isinstance(raw_page, str) else raw_page
         element_type = ElementTypes.from_str(page["type"])
 
         if element_type == ElementTypes.MESSAGE:
-            return [
-                self.deserialize_message(
-                    cast(Union[RegularMessage, ExpansiveMessage], page),
-                    callables,
-                    events,
-                )
-            ]
+            message = cast(Union[RegularMessage, ExpansiveMessage], page)
+            return [partial(self.deserialize_message, message, callables, events)]
         if element_type == ElementTypes.EXPANSIVE:
-            return self.deserialize_expansive(cast(ExpansiveMessage, page), callables, events)
+            return self.deserialize_expansive_lazily(cast(ExpansiveMessage, page), callables, events)
         raise TypeError(f"Unrecognized Element Type: {element_type}")
 
     def deserialize_menu(
@@ -336,17 +602,57 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (List[Message]): A list of Display objects
         """
-        pages: List[Message] = sum(
-            (self.deserialize_page(document, page, callables, events) for page in menu["pages"]),
+        pages: List[PageThunk] = sum(
+            (self.deserialize_page_lazily(document, page, callables, events) for page in menu["pages"]),
             [],
         )
-        timeout: Optional[float] = menu.get("timeout", 180.0)
+        return Menu(pages, events=events, **self._deserialize_menu_options(menu))
+
+    async def deserialize_pages_async(
+        self,
+        document: Document,
+        raw_pages: List[Union[str, Page]],
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> AsyncIterator[PageThunk]:
+        """Method to split the pages of a menu one at a time, yielding to the event loop after every page
 
-        if "arrows" not in menu:
-            return Menu(pages, timeout, events=events)
+        Args:
+            document (Document): the original document containing all the keys.
+            raw_pages (List[Union[str, Page]]): The pages to deserialize
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+
+        Returns (AsyncIterator[PageThunk]): The functions that deserialize the pages of the menu
+        """
+        for raw_page in raw_pages:
+            for page in self.deserialize_page_lazily(document, raw_page, callables, events):
+                yield page
+            await asyncio.sleep(0)
 
-        arrows: Dict[MenuActions, ButtonComponent] = self._deserialize_menu_arrows(menu["arrows"])
-        return Menu(pages, timeout, arrows, events)
+    async def deserialize_menu_async(
+        self,
+        menu: MenuMessage,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+        *,
+        document: Document,
+    ) -> Menu:
+        """Method to deserialize a menu cooperatively, yielding to the event loop between its pages
+
+        Args:
+            menu (MenuMessage): The Menu Dictionary to deserialize into a List of Messages
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the buttons
+            events (EventCallbacks): A dictionary containing the event callbacks.
+            document (Document): the original document containing all the keys.
+
+        Returns (Menu): The menu
+        """
+        return await Menu.from_pages(
+            self.deserialize_pages_async(document, menu["pages"], callables, events),
+            events=events,
+            **self._deserialize_menu_options(menu),
+        )
 
     def deserialize_modal(
         self,
@@ -491,13 +797,12 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (ui.Item): the rendered select menu
         """
-        raw_options = component.pop("options")
+        raw_options = component["options"]
 
         assert isinstance(raw_options, list)
 
-        options = self._render_options(raw_options)
         attributes: Dict[str, Any] = cast(Dict[str, Any], component.copy())
-        attributes["options"] = options
+        attributes["options"] = self._render_options(raw_options)
 
         select: ui.Select = create_select(callback=callback, **attributes)
         return select
@@ -528,10 +833,11 @@ class JSONDeserializer(Deserializer[K_contra]):
 
         Returns (ui.TextInput): the rendered text input block.
         """
+        text_input_component: TextInputComponent = component.copy()
         if callback is not None:
-            component["callback"] = callback
+            text_input_component["callback"] = callback
 
-        text_input: ui.TextInput = create_text_input(component)
+        text_input: ui.TextInput = create_text_input(text_input_component)
         return text_input
 
     def render_component(
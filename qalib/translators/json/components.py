@@ -185,6 +185,7 @@ class ExpansiveMessage(BaseMessage):
     embed: ExpansiveEmbed
     arrows: NotRequired[Arrows]
     page_number_key: NotRequired[str]
+    single_view: NotRequired[bool]
 
 
 Page = Union[RegularMessage, ExpansiveMessage]
@@ -194,6 +195,7 @@ class MenuMessage(Element):
     timeout: NotRequired[Optional[float]]
     pages: List[Union[str, Page]]
     arrows: NotRequired[Arrows]
+    single_view: NotRequired[bool]
 
 
 class Modal(Element):
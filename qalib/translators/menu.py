@@ -1,16 +1,36 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from enum import Enum
-from typing import List, Optional, Dict, Any, Callable, TYPE_CHECKING, Coroutine, cast
+from collections import OrderedDict
+from dataclasses import replace
+import asyncio
+from typing import (
+    Awaitable,
+    Generic,
+    TypeVar,
+    List,
+    Optional,
+    Dict,
+    Any,
+    AsyncIterable,
+    Callable,
+    TYPE_CHECKING,
+    Coroutine,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 import discord.ui.button
 
 from qalib.translators import Message, Callback
 
 if TYPE_CHECKING:
-    from qalib.translators.events import EventCallbacks
-from qalib.translators.view import QalibView
+    from qalib.renderer import Renderer
+    from qalib.translators.events import EventCallback, EventCallbacks
+from qalib.translators.view import QalibView, TimeoutEvent, ViewEvents
 from qalib.translators.message_parsing import ButtonComponent, create_button
 
 
@@ -33,25 +53,152 @@ class MenuEvents(Enum):
     ON_CHANGE = "on_change"
 
 
-class Menu:
-    """Class that represents a menu. It is used to store the pages of the menu, as well as the buttons that are used"""
+class MenuOptions(TypedDict):
+    """Options of a menu that are read from its element in the document, which are shared by every path that builds
+    the menu."""
+
+    timeout: Optional[float]
+    arrows: Optional[Dict[MenuActions, ButtonComponent]]
+    single_view: bool
+
+
+PageThunk = Callable[[], Message]
+Page = Union[Message, PageThunk]
+DEFAULT_PAGE_CACHE_SIZE = 8
+ARROW_ROW = 4
+ROW_WIDTH = 5
+
+
+def fits_above_arrows(view: Optional[discord.ui.View]) -> bool:
+    """Determines whether the components of the view fit in the rows above the row that single view menus reserve
+    for their arrow buttons, placing them the way that discord places the components of a view.
+
+    Args:
+        view (Optional[discord.ui.View]): view of a page
+
+    Returns (bool): True if the components fit above the arrow buttons
+    """
+    if view is None:
+        return True
+    weights = [0] * ARROW_ROW
+    for item in sorted(view.children, key=lambda child: ARROW_ROW if child.row is None else child.row):
+        if item.row is None:
+            row = next((row for row, weight in enumerate(weights) if weight + item.width <= ROW_WIDTH), None)
+        else:
+            row = item.row if item.row < ARROW_ROW and weights[item.row] + item.width <= ROW_WIDTH else None
+        if row is None:
+            return False
+        weights[row] += item.width
+    return True
+
+
+class MenuView(QalibView):
+    """View of a single view menu, which holds the components of the page that is shown. The checks and errors of
+    the interactions with the components are deferred to the view of that page, while the timeout is the timeout of
+    the menu."""
+
+    def __init__(self, events: EventCallbacks, timeout: Optional[float] = 180) -> None:
+        super().__init__(events, timeout)
+        self.page: Optional[discord.ui.View] = None
+
+    async def on_error(self, interaction: discord.Interaction, exception: Exception, item: discord.ui.Item) -> None:
+        if self.page is None:
+            await super().on_error(interaction, exception, item)
+        else:
+            await self.page.on_error(interaction, exception, item)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.page is None:
+            return await super().interaction_check(interaction)
+        return await self.page.interaction_check(interaction)
+
 
-    __slots__ = "_pages", "_timeout", "_arrows", "_events", "_active_page", "_front_page", "_linked"
+class Menu:
+    """Class that represents a menu. It is used to store the pages of the menu, as well as the buttons that are used
+    to navigate between them. The navigation buttons are created once per menu, and are only attached to the view of
+    the page that is shown, so that building a menu does not grow with the number of its pages.
+
+    Pages can be given as thunks, functions that render the page, which are only called the first time that the page
+    is shown. The most recently used rendered pages are kept, so that navigating back and forth does not render them
+    again. Single view menus show every page on one view, which holds the components of the page that is shown.
+    """
+
+    __slots__ = (
+        "_pages",
+        "_timeout",
+        "_arrows",
+        "_events",
+        "_active_page",
+        "_front_page",
+        "_controls",
+        "_shown",
+        "_rendered",
+        "_cache_size",
+        "_single_view",
+        "_view",
+    )
 
     def __init__(
         self,
-        pages: List[Message],
+        pages: Sequence[Page],
         timeout: Optional[float] = None,
         arrows: Optional[Dict[MenuActions, ButtonComponent]] = None,
         events: Optional[EventCallbacks] = None,
+        *,
+        cache_size: int = DEFAULT_PAGE_CACHE_SIZE,
+        single_view: bool = False,
     ) -> None:
+        """Initialisation of the menu
+
+        Args:
+            pages (Sequence[Page]): pages of the menu, either rendered or as thunks that render them
+            timeout (Optional[float]): timeout of the views of the pages
+            arrows (Optional[Dict[MenuActions, ButtonComponent]]): buttons that are used to navigate between the pages
+            events (Optional[EventCallbacks]): callbacks that are called on events
+            cache_size (int): number of pages rendered from thunks that are kept
+            single_view (bool): whether every page is shown on a single view of the menu, so that an open menu has a
+                single view and a single timeout, instead of a view for every page
+        """
         self._pages = pages
         self._timeout = timeout
         self._arrows = arrows
         self._events = {} if events is None else events
         self._active_page = 0
         self._front_page = 0
-        self._link()
+        self._controls: Optional[Dict[MenuActions, discord.ui.Button]] = None
+        self._shown: Optional[Tuple[int, Message]] = None
+        self._rendered: OrderedDict[int, Message] = OrderedDict()
+        self._cache_size = cache_size
+        self._single_view = single_view
+        self._view: Optional[MenuView] = None
+        if single_view:
+            for index, page in enumerate(pages):
+                if isinstance(page, Message):
+                    self._check_room(index, page)
+
+    @classmethod
+    async def from_pages(
+        cls,
+        pages: AsyncIterable[Page],
+        timeout: Optional[float] = None,
+        arrows: Optional[Dict[MenuActions, ButtonComponent]] = None,
+        events: Optional[EventCallbacks] = None,
+        *,
+        single_view: bool = False,
+    ) -> Menu:
+        """This method is used to build a menu from pages that are produced asynchronously, such as by an async
+        generator that yields to the event loop between pages.
+
+        Args:
+            pages (AsyncIterable[Page]): pages of the menu, either rendered or as thunks that render them
+            timeout (Optional[float]): timeout of the views of the pages
+            arrows (Optional[Dict[MenuActions, ButtonComponent]]): buttons that are used to navigate between the pages
+            events (Optional[EventCallbacks]): callbacks that are called on events
+            single_view (bool): whether every page is shown on a single view of the menu
+
+        Returns (Menu): the menu
+        """
+        return cls([page async for page in pages], timeout, arrows, events, single_view=single_view)
 
     def add_event(self, event: MenuEvents, callback: MenuChangeEvent) -> None:
         """This method is used to add an event to the menu.
@@ -63,64 +210,183 @@ class Menu:
         self._events[event] = callback
 
     async def call_event(self, event: MenuEvents) -> None:
-        await cast(MenuChangeEvent, self._events[event])(self)
+        if event in self._events:
+            await cast(MenuChangeEvent, self._events[event])(self)
 
-    def _create_arrows(self, left: Optional[int] = None, right: Optional[int] = None) -> List[discord.ui.Button]:
-        """This function creates the arrow buttons that are used to navigate between the pages.
+    def _create_arrows(self) -> Dict[MenuActions, discord.ui.Button]:
+        """This function creates the arrow buttons that are used to navigate between the pages, which move relative to
+        the page that was sent last, so that the same buttons serve every page.
+
+        Returns (Dict[MenuActions, discord.ui.Button]): the arrow buttons by their action
+        """
+
+        def navigate(step: int) -> Callback:
+            async def callback(_: discord.ui.Item, interaction: discord.Interaction):
+                await self._navigate(interaction, self._active_page + step)
+
+            return callback
+
+        arrows: Dict[MenuActions, discord.ui.Button] = {}
+        for action, step in ((MenuActions.PREVIOUS, -1), (MenuActions.NEXT, 1)):
+            button = (self._arrows or DefaultButtons).get(action, DefaultButtons[action])
+            arrows[action] = create_button(cast(ButtonComponent, {**button, "callback": navigate(step)}))
+        return arrows
+
+    async def _navigate(self, interaction: discord.Interaction, index: int) -> None:
+        """Shows the page in place of the page that is shown, and calls the ON_CHANGE event.
+
+        Args:
+            interaction (discord.Interaction): interaction of the arrow button that was clicked
+            index (int): index of the page
+        """
+        await self.load(index)
+        page = self._link_page(index)
+        await interaction.response.edit_message(**page.convert_to_interaction_message().as_edit().dict())
+
+        self._active_page = index
+        await self.call_event(MenuEvents.ON_CHANGE)
+
+    def _link_page(self, index: int) -> Message:
+        """Attaches the arrow buttons to the view of the page, detaching them from the page that was shown before.
 
         Args:
-            left (Optional[Message]): embed and view of the left page
-            right (Optional[Display]): embed and view of the right page
+            index (int): index of the page
 
-        Returns (List[discord.ui.Button]): list of the arrow buttons
+        Returns (Message): the page
         """
+        if self._shown is not None and self._shown[0] == index:
+            return self._shown[1]
+        if self._single_view:
+            return self._link_single_view(index)
+        message = self._page(index)
+        if self._controls is None:
+            self._controls = self._create_arrows()
+
+        if self._shown is not None and (shown := self._shown[1].view) is not None:
+            for arrow in self._controls.values():
+                shown.remove_item(arrow)
+
+        if message.view is None:
+            message.view = QalibView(self._events, timeout=self._timeout)
+
+        if index > 0:
+            message.view.add_item(self._controls[MenuActions.PREVIOUS])
+        if index + 1 < len(self):
+            message.view.add_item(self._controls[MenuActions.NEXT])
+        self._shown = index, message
+        return message
+
+    @staticmethod
+    def _check_room(index: int, page: Message) -> None:
+        """Checks that the components of the page leave the last row of the single view free for the arrow buttons.
 
-        def create_view(index: int) -> Callback:
-            async def callback(_: discord.ui.Item, interaction: discord.Interaction):
-                await interaction.response.edit_message(
-                    **self._pages[index].convert_to_interaction_message().as_edit().dict()
-                )
+        Args:
+            index (int): index of the page
+            page (Message): the rendered page
 
-                self._active_page = index
-                await self.call_event(MenuEvents.ON_CHANGE)
+        Raises:
+            ValueError: if the components of the page take up the row of the arrow buttons
+        """
+        if not fits_above_arrows(page.view):
+            raise ValueError(f"Components of page {index} do not leave the last row of the single view to its arrows")
 
-            return callback
+    def _link_single_view(self, index: int) -> Message:
+        """Shows the page on the single view of the menu, in place of the components of the page that was shown before,
+        and enables only the arrow buttons that lead to another page. The arrow buttons have the last row of the view to
+        themselves, and the view of the page keeps handling the checks and errors of its components.
 
-        buttons: List[discord.ui.Button] = []
+        Args:
+            index (int): index of the page
 
-        def construct_button(display: Optional[int], action: MenuActions) -> None:
-            if display is None:
-                return
-            button = deepcopy(
-                self._arrows[action] if self._arrows is not None and action in self._arrows else DefaultButtons[action]
-            )
-            button["callback"] = create_view(display)
-            buttons.append(create_button(button))
+        Returns (Message): the page, with the view of the menu in place of its own view
+        """
+        page = self._page(index)
+        self._check_room(index, page)
+        if self._controls is None:
+            self._controls = self._create_arrows()
+            for arrow in self._controls.values():
+                arrow.row = ARROW_ROW
+        if self._view is None:
+            self._view = MenuView(self._events, timeout=self._timeout)
+
+        self._view.clear_items()
+        self._view.page = page.view
+        if page.view is not None:
+            for item in page.view.children:
+                self._view.add_item(item)
+
+        self._controls[MenuActions.PREVIOUS].disabled = index == 0
+        self._controls[MenuActions.NEXT].disabled = index + 1 >= len(self)
+        for arrow in self._controls.values():
+            self._view.add_item(arrow)
+
+        message = replace(page, view=self._view)
+        self._shown = index, message
+        return message
+
+    def _page(self, index: int) -> Message:
+        """Retrieves the page, rendering it if it is a thunk that has not been rendered, or has been evicted from the
+        most recently used pages.
 
-        construct_button(left, MenuActions.PREVIOUS)
-        construct_button(right, MenuActions.NEXT)
+        Args:
+            index (int): index of the page
 
-        return buttons
+        Returns (Message): the rendered page
+        """
+        page = self._pages[index]
+        if isinstance(page, Message):
+            return page
+        if (message := self._rendered.get(index)) is not None:
+            self._rendered.move_to_end(index)
+            return message
+        return self._remember(index, page())
+
+    def _remember(self, index: int, message: Message) -> Message:
+        """Keeps the rendered page among the most recently used pages, evicting the least recently used page if there
+        are too many.
 
-    def _link(self) -> None:
-        for i, message in enumerate(self._pages):
-            left = i - 1 if i > 0 else None
-            right = i + 1 if i + 1 < len(self._pages) else None
+        Args:
+            index (int): index of the page
+            message (Message): the rendered page
 
-            if message.view is None:
-                message.view = QalibView(self._events, timeout=self._timeout)
+        Returns (Message): the rendered page
+        """
+        self._rendered[index] = message
+        self._rendered.move_to_end(index)
+        while len(self._rendered) > self._cache_size:
+            self._rendered.popitem(last=False)
+        return message
 
-            for arrow in self._create_arrows(left, right):
-                message.view.add_item(arrow)
+    async def load(self, index: int) -> Message:
+        """This method is used to render the page ahead of showing it, which is called before every page that is
+        navigated to.
+
+        Args:
+            index (int): index of the page
+
+        Returns (Message): the rendered page
+        """
+        return self._page(index)
 
     def __len__(self) -> int:
         return len(self._pages)
 
     def __getitem__(self, item: int) -> Message:
-        return self._pages[item]
+        """Retrieves the page without attaching the arrow buttons to it, so that retrieving a page does not change the
+        page that is shown. Only the page that is shown has the arrow buttons, or the single view of the menu.
+
+        Args:
+            item (int): index of the page
+
+        Returns (Message): the page
+        """
+        index = range(len(self))[item]
+        if self._shown is not None and self._shown[0] == index:
+            return self._shown[1]
+        return self._page(index)
 
     def current_page(self) -> Message:
-        return self[self._active_page]
+        return self._link_page(self._active_page)
 
     @property
     def index(self) -> int:
@@ -128,12 +394,187 @@ class Menu:
 
     @property
     def front(self) -> Message:
-        return self._pages[self._front_page]
+        """The page that the menu is sent with, along with the arrow buttons that navigate away from it.
+
+        Returns (Message): the front page
+        """
+        self._active_page = self._front_page
+        return self._link_page(self._front_page)
 
     def set_front_page(self, index: int) -> None:
-        if index >= len(self._pages):
+        if index >= len(self):
             raise IndexError("Index out of bounds")
         self._front_page = index
 
 
 MenuChangeEvent = Callable[[Menu], Coroutine[Any, Any, None]]
+
+
+K = TypeVar("K")
+PageProvider = Callable[[int], Awaitable[Dict[str, Any]]]
+DEFAULT_PREFETCH = 1
+
+
+class VirtualMenu(Menu, Generic[K]):
+    """Menu whose pages are rendered on demand from a data source, such as the results of a database query, which can
+    run to more pages than could be rendered up front. The keywords of every page are loaded by the page provider, and
+    the key is rendered with them by the renderer. The neighbouring pages of every page that is loaded are prefetched
+    in the background, and only the most recently used pages are kept.
+
+    Pages have to be loaded before they are shown, which is done by open for the front page, and by the arrow buttons
+    for every page that they navigate to. The pages that are still being prefetched are cancelled once the view of the
+    page that is shown times out.
+    """
+
+    __slots__ = "_renderer", "_key", "_page_count", "_page_provider", "_callbacks", "_prefetch", "_loading"
+
+    def __init__(
+        self,
+        renderer: Renderer[K],
+        key: K,
+        page_count: int,
+        page_provider: PageProvider,
+        timeout: Optional[float] = None,
+        arrows: Optional[Dict[MenuActions, ButtonComponent]] = None,
+        events: Optional[EventCallbacks] = None,
+        callbacks: Optional[Dict[str, Callback]] = None,
+        *,
+        cache_size: int = DEFAULT_PAGE_CACHE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
+        single_view: bool = False,
+    ) -> None:
+        """Initialisation of the virtual menu
+
+        Args:
+            renderer (Renderer[K]): renderer that renders the pages
+            key (K): key of the message that every page is rendered from
+            page_count (int): number of pages of the menu
+            page_provider (PageProvider): coroutine function that loads the keywords of the page at the index
+            timeout (Optional[float]): timeout of the views of the pages
+            arrows (Optional[Dict[MenuActions, ButtonComponent]]): buttons that are used to navigate between the pages
+            events (Optional[EventCallbacks]): callbacks that are called on events
+            callbacks (Optional[Dict[str, Callback]]): callbacks that are attached to the components of the pages
+            cache_size (int): number of rendered pages that are kept, which has to hold a loaded page along with the
+                pages that are prefetched on either side of it
+            prefetch (int): number of pages on either side of a loaded page that are prefetched
+            single_view (bool): whether every page is shown on a single view of the menu
+
+        Raises:
+            ValueError: if the cache size is smaller than a loaded page and its prefetched pages
+        """
+        if cache_size < 2 * prefetch + 1:
+            raise ValueError(f"Cache size {cache_size} cannot hold a page and the {2 * prefetch} pages around it")
+        super().__init__([], timeout, arrows, events, cache_size=cache_size, single_view=single_view)
+        on_timeout = self._on_timeout(self._events.get(ViewEvents.ON_TIMEOUT))
+        self._events = {**self._events, ViewEvents.ON_TIMEOUT: on_timeout}
+        self._renderer = renderer
+        self._key = key
+        self._page_count = page_count
+        self._page_provider = page_provider
+        self._callbacks = {} if callbacks is None else callbacks
+        self._prefetch = prefetch
+        self._loading: Dict[int, asyncio.Task[Message]] = {}
+
+    def __len__(self) -> int:
+        return self._page_count
+
+    def _on_timeout(self, event: Optional[EventCallback]) -> TimeoutEvent:
+        """Creates the timeout event of the views of the menu, which cancels the pages that are being prefetched once
+        the view of the page that is shown times out, before calling the timeout event that the menu was given.
+
+        Args:
+            event (Optional[EventCallback]): timeout event that the menu was given
+
+        Returns (TimeoutEvent): the timeout event of the views
+        """
+
+        async def on_timeout(view: discord.ui.View) -> None:
+            if self._shown is not None and self._shown[1].view is view:
+                self.cancel()
+            if event is not None:
+                await cast(TimeoutEvent, event)(view)
+
+        return on_timeout
+
+    def cancel(self) -> None:
+        """This method is used to cancel every page that is being rendered in the background."""
+        for task in list(self._loading.values()):
+            task.cancel()
+
+    def _page(self, index: int) -> Message:
+        if (message := self._rendered.get(index)) is None:
+            raise LookupError(f"Page {index} has not been loaded")
+        self._rendered.move_to_end(index)
+        return message
+
+    async def _render(self, index: int) -> Message:
+        """Loads the keywords of the page, and renders the page with them.
+
+        Args:
+            index (int): index of the page
+
+        Returns (Message): the rendered page
+        """
+        keywords = await self._page_provider(index)
+        message = await self._renderer.render_async(self._key, self._callbacks, keywords, self._events)
+        if not isinstance(message, Message):
+            raise TypeError(f"Pages of a virtual menu have to be messages, not {type(message).__name__}")
+        return self._remember(index, message)
+
+    def _fetch(self, index: int) -> asyncio.Task[Message]:
+        """Renders the page in the background, unless it is already being rendered.
+
+        Args:
+            index (int): index of the page
+
+        Returns (asyncio.Task[Message]): the task that renders the page
+        """
+        if (task := self._loading.get(index)) is not None:
+            return task
+
+        def done(finished: asyncio.Task[Message]) -> None:
+            del self._loading[index]
+            if not finished.cancelled():
+                finished.exception()
+
+        task = self._loading[index] = asyncio.get_running_loop().create_task(self._render(index))
+        task.add_done_callback(done)
+        return task
+
+    async def load(self, index: int) -> Message:
+        """This method is used to render the page, if it is not among the most recently used pages, and to prefetch
+        its neighbouring pages in the background.
+
+        Args:
+            index (int): index of the page
+
+        Returns (Message): the rendered page
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("Index out of bounds")
+        if (message := self._rendered.get(index)) is not None:
+            self._rendered.move_to_end(index)
+        else:
+            message = await self._fetch(index)
+
+        for neighbour in range(max(index - self._prefetch, 0), min(index + self._prefetch + 1, len(self))):
+            if neighbour not in self._rendered:
+                self._fetch(neighbour)
+        return message
+
+    async def open(self, index: int = 0) -> Message:
+        """This method is used to load the front page of the menu, and retrieve it along with its arrow buttons.
+
+        Args:
+            index (int): index of the front page
+
+        Returns (Message): the front page
+        """
+        self.set_front_page(index)
+        await self.load(index)
+        return self.front
+
+    async def prefetched(self) -> None:
+        """This method is used to wait until every page that is rendered in the background has been rendered."""
+        while self._loading:
+            await asyncio.wait(list(self._loading.values()))
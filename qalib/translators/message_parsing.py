@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import wraps
+from functools import lru_cache
 from typing import (
     Dict,
     TypeVar,
@@ -15,9 +15,7 @@ from typing import (
     Callable,
 )
 
-import discord_emoji as de
 import discord.partial_emoji
-import emoji
 from discord import ui, utils
 from typing_extensions import NotRequired, Concatenate, ParamSpec
 
@@ -141,51 +139,70 @@ def make_emoji(raw_emoji: Optional[Union[str, Emoji]]) -> Optional[str]:
     if "name" not in raw_emoji:
         raise ValueError("Missing Emoji Name")
 
+    # the emoji tables are only loaded on the first emoji that is resolved, as they make up most of the import time
+    import emoji  # pylint: disable=import-outside-toplevel
+
     if emoji.is_emoji(raw_emoji["name"]):
         return raw_emoji["name"]
 
     if "id" not in raw_emoji:
-        return de.to_unicode(raw_emoji["name"])
+        import discord_emoji  # pylint: disable=import-outside-toplevel
+
+        return discord_emoji.to_unicode(raw_emoji["name"])
 
     string = f"a:{raw_emoji['name']}:" if raw_emoji.get("animated", False) else f":{raw_emoji['name']}:"
     return string + str(raw_emoji["id"]) if "id" in raw_emoji else string
 
 
-def _create_callback(callback: Callback[I]) -> Callback[I]:
-    """Wraps the callback to ensure that bound methods are still bound to their instance.
+ItemT = TypeVar("ItemT", bound=ui.Item)
+
+
+class _CallbackItem(ui.Item):
+    """Mixin that dispatches the interactions of an item to the callback that is stored on the item itself, so that a
+    single subclass of every item type serves every callback, rather than a new subclass for every rendered item.
+    Storing the callback on the instance also keeps bound methods bound to their instance.
+    """
+
+    _qalib_callback: Callback
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await self._qalib_callback(self, interaction)
 
-    meant to remedy the following
-    e.g.:
-    ```py
-        class Event:
-            async def on_button_click(self, item: I, interaction: discord.Interaction) -> None:
-                ...
 
-        >>> event = Event()
-        >>> type(ui.Button.__name__, (ui.Button,), {"callback": event.on_button_click})
-    ```
+@lru_cache(maxsize=None)
+def _callback_item(item: Type[ItemT]) -> Type[ItemT]:
+    """Retrieves the subclass of the item type that dispatches to the callback stored on its instances, which is only
+    created the first time that the item type is used.
 
-    This would not work as the new method would lose the __self__
+    Args:
+        item (Type[ItemT]): type of the item
 
+    Returns (Type[ItemT]): the dispatching subclass, which has the same name as the item type
     """
+    return cast(Type[ItemT], type(item.__name__, (_CallbackItem, item), {"__module__": item.__module__}))
+
 
-    @wraps(callback)
-    async def wrapper(item: I, interaction: discord.Interaction) -> None:
-        await callback(item, interaction)
+def _create_item(item: Type[ItemT], callback: Optional[Callback], **kwargs) -> ItemT:
+    """Creates the item, attaching the callback to it if there is one.
 
-    return wrapper
+    Args:
+        item (Type[ItemT]): type of the item
+        callback (Optional[Callback]): callback that is called when the item is interacted with
+        **kwargs: arguments of the item
+
+    Returns (ItemT): the item
+    """
+    if callback is None:
+        return item(**kwargs)
+    instance = _callback_item(item)(**kwargs)
+    instance._qalib_callback = callback  # pylint: disable=protected-access
+    return instance
 
 
 def create_button(component: ButtonComponent) -> ui.Button:
-    button: Type[ui.Button] = ui.Button
-    if "callback" in component:
-        callback = _create_callback(component["callback"])
-        button = cast(
-            Type[ui.Button],
-            type(ui.Button.__name__, (ui.Button,), {"callback": callback}),
-        )
-
-    return button(
+    return _create_item(
+        ui.Button,
+        component.get("callback"),
         style=BUTTON_STYLES[component.get("style", "primary")],
         custom_id=component.get("custom_id"),
         label=component.get("label"),
@@ -197,18 +214,9 @@ def create_button(component: ButtonComponent) -> ui.Button:
 
 
 def create_channel_select(**kwargs) -> ui.ChannelSelect:
-    channel_select: Type[ui.ChannelSelect] = ui.ChannelSelect
-    if kwargs.get("callback") is not None:
-        callback = _create_callback(kwargs["callback"])
-        channel_select = cast(
-            Type[ui.ChannelSelect],
-            type(
-                ui.ChannelSelect.__name__,
-                (ui.ChannelSelect,),
-                {"callback": callback},
-            ),
-        )
-    return channel_select(
+    return _create_item(
+        ui.ChannelSelect,
+        kwargs.get("callback"),
         custom_id=kwargs.get("custom_id", utils.MISSING),
         channel_types=kwargs.get("channel_types", utils.MISSING),
         placeholder=kwargs.get("placeholder"),
@@ -220,15 +228,9 @@ def create_channel_select(**kwargs) -> ui.ChannelSelect:
 
 
 def create_select(**kwargs) -> ui.Select:
-    select: Type[ui.Select] = ui.Select
-    if kwargs.get("callback") is not None:
-        callback = _create_callback(kwargs["callback"])
-        select = cast(
-            Type[ui.Select],
-            type(ui.Select.__name__, (ui.Select,), {"callback": callback}),
-        )
-
-    return select(
+    return _create_item(
+        ui.Select,
+        kwargs.get("callback"),
         custom_id=kwargs.get("custom_id", utils.MISSING),
         placeholder=kwargs.get("placeholder"),
         min_values=int(kwargs.get("min_values", 1)),
@@ -240,14 +242,9 @@ def create_select(**kwargs) -> ui.Select:
 
 
 def create_type_select(select: SelectTypes, **kwargs) -> Union[ui.RoleSelect, ui.UserSelect, ui.MentionableSelect]:
-    if kwargs.get("callback") is not None:
-        callback = _create_callback(kwargs["callback"])
-        select = cast(
-            SelectTypes,
-            type(select.__name__, (select,), {"callback": callback}),
-        )
-
-    return select(
+    return _create_item(
+        select,
+        kwargs.get("callback"),
         custom_id=kwargs.get("custom_id", utils.MISSING),
         placeholder=kwargs.get("placeholder"),
         min_values=int(kwargs.get("min_values", 1)),
@@ -258,18 +255,9 @@ def create_type_select(select: SelectTypes, **kwargs) -> Union[ui.RoleSelect, ui
 
 
 def create_text_input(text_input_component: TextInputComponent) -> ui.TextInput:
-    text_input: Type[ui.TextInput] = ui.TextInput
-    if "callback" in text_input_component:
-        callback = _create_callback(text_input_component["callback"])
-        text_input = cast(
-            Type[ui.TextInput],
-            type(
-                ui.TextInput.__name__,
-                (ui.TextInput,),
-                {"callback": callback},
-            ),
-        )
-    return text_input(
+    return _create_item(
+        ui.TextInput,
+        text_input_component.get("callback"),
         label=text_input_component.get("label", ""),
         custom_id=text_input_component.get("custom_id", utils.MISSING),
         style=TEXT_STYLES[text_input_component.get("style", "short")],
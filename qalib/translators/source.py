@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+from threading import Lock
+from typing import Optional, Protocol, Tuple
+
+Stamp = Tuple[int, int]
+
+
+def stamp(filename: str) -> Stamp:
+    """Retrieves the modification time and size of the file, which identify the version of its contents.
+
+    Args:
+        filename (str): path of the file
+
+    Returns (Stamp): modification time in nanoseconds and size of the file
+    """
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Source(Protocol):
+    """Protocol that represents the source text of a document, which is read by the Renderer when the document is
+    templated before it is parsed."""
+
+    def read(self) -> str:
+        """Method that is used to read the source text of the document.
+
+        Returns (str): source text of the document
+        """
+        raise NotImplementedError
+
+    def stamp(self) -> Optional[Stamp]:
+        """Method that is used to retrieve the version of the source text, which changes whenever the text does.
+
+        Returns (Optional[Stamp]): the version of the source text, or None if the text never changes
+        """
+        return None
+
+
+class FileSource(Source):
+    """Source that caches the contents of the file, and only reads the file again once its modification time or size
+    has changed."""
+
+    __slots__ = "_filename", "_stamp", "_text", "_lock"
+
+    def __init__(self, filename: str):
+        """Initialisation of the file source
+
+        Args:
+            filename (str): path of the file
+        """
+        self._filename = filename
+        self._stamp: Optional[Stamp] = None
+        self._text = ""
+        self._lock = Lock()
+
+    def read(self) -> str:
+        """Method that is used to read the contents of the file, from the cache if the file has not changed.
+
+        Returns (str): contents of the file
+        """
+        current = stamp(self._filename)
+        with self._lock:
+            if current != self._stamp:
+                with open(self._filename, "r", encoding="utf-8") as file:
+                    self._text = file.read()
+                self._stamp = current
+            return self._text
+
+    def stamp(self) -> Optional[Stamp]:
+        """Method that is used to retrieve the modification time and size of the file.
+
+        Returns (Optional[Stamp]): the stamp of the file
+        """
+        return stamp(self._filename)
+
+
+class InMemorySource(Source):
+    """Source that keeps the contents of the file in memory, and never reads the file again."""
+
+    __slots__ = ("_text",)
+
+    def __init__(self, filename: str, text: Optional[str] = None):
+        """Initialisation of the in-memory source
+
+        Args:
+            filename (str): path of the file
+            text (Optional[str]): contents of the file, which are read from the file if not given
+        """
+        if text is None:
+            with open(filename, "r", encoding="utf-8") as file:
+                text = file.read()
+        self._text = text
+
+    def read(self) -> str:
+        """Method that is used to read the contents of the file that are kept in memory.
+
+        Returns (str): contents of the file
+        """
+        return self._text
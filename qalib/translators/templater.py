@@ -1,9 +1,54 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Protocol
+import warnings
+from typing import Any, Callable, Dict, Generic, Protocol, TypeVar
+from weakref import WeakKeyDictionary
 
 from qalib.template_engines.template_engine import TemplateEngine
 
+T = TypeVar("T")
+
+
+def report_duplicate_key(key: str) -> None:
+    """Reports a key that identifies more than one element of a document with a warning, as only one of the elements
+    can be rendered by the key. Every format reports its duplicate keys this way, rather than raising an error, so that
+    documents that used to load keep loading.
+
+    Args:
+        key (str): the duplicate key
+    """
+    warnings.warn(f"Duplicate key: {key}", stacklevel=3)
+
+
+class EngineCache(Generic[T]):
+    """Cache of a value that is computed once per template syntax, such as the analysis of the nodes of a document
+    that contain no template syntax for the engine. It is keyed by the syntax key of the template engine, so that
+    every instance of a template engine with the same syntax shares the value. Syntax keys that can not be weakly
+    referenced are not cached."""
+
+    __slots__ = "_factory", "_values"
+
+    def __init__(self, factory: Callable[[TemplateEngine], T]):
+        self._factory = factory
+        self._values: WeakKeyDictionary[Any, T] = WeakKeyDictionary()
+
+    def get(self, template_engine: TemplateEngine) -> T:
+        """Retrieves the value for the syntax of the template engine, computing it if it has not been computed yet.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the value is computed for
+
+        Returns (T): the value for the syntax of the template engine
+        """
+        key = template_engine.syntax_key()
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = self._factory(template_engine)
+            return value
+        except TypeError:
+            return self._factory(template_engine)
+
 
 class Templater(Protocol):
     """Protocol that represents the parser. It is meant to be placed into a Renderer, and is responsible for parsing the
@@ -28,3 +73,39 @@ class Templater(Protocol):
         Returns (str): templated embed in the form of string.
         """
         raise NotImplementedError
+
+    def template_key(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references, so that the cost of templating grows with the size of the element rather than the document.
+        Templaters that can not scope the document fall back to templating the whole of it.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (str): templated document containing the element in the form of string.
+        """
+        return self.template(template_engine, keywords)
+
+    def preload(self, template_engine: TemplateEngine) -> None:
+        """This method is used to prepare every element of the document for the template engine ahead of the first
+        render, such as compiling the strings that are templated. Templaters that have nothing to prepare do nothing.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is prepared for
+        """
+
+    def template_document(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> Any:
+        """This method is used to template the element identified by the key, and hand it over to the deserializer
+        in its parsed form (see Deserializer.deserialize_document), saving the deserializer from parsing the document
+        again. Templaters that do not produce a parsed document return the templated source as a string.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (Any): templated document in its parsed form, or in the form of string.
+        """
+        return self.template_key(key, template_engine, keywords)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from functools import partial
-from typing import Optional, Dict, Any, List, Callable, Sequence, cast, Type
+from typing import Optional, Dict, Any, AsyncIterator, List, Callable, Sequence, Set, cast, Type
+from weakref import WeakKeyDictionary
 from xml.etree import ElementTree
 
 import discord
+from deprecated import deprecated
 from discord import ui
 from discord.abc import Snowflake
 
@@ -12,10 +15,10 @@ from qalib.template_engines.template_engine import TemplateEngine
 from qalib.translators import Callback, Message, DiscordIdentifier
 from qalib.translators.deserializer import Deserializer, K_contra, ReturnType, ElementTypes
 from qalib.translators.element.embed import render
-from qalib.translators.element.expansive import expand
+from qalib.translators.element.expansive import expand_lazily
 from qalib.translators.element.types.embed import Emoji
 from qalib.translators.events import EventCallbacks
-from qalib.translators.menu import Menu, MenuActions
+from qalib.translators.menu import Menu, MenuActions, MenuOptions, PageThunk
 from qalib.translators.message_parsing import (
     ButtonComponent,
     apply,
@@ -30,9 +33,10 @@ from qalib.translators.message_parsing import (
     TextInputComponent,
 )
 from qalib.translators.modal import ModalEvents, ModalEventsCallbacks, QalibModal
-from qalib.translators.templater import Templater
+from qalib.translators.templater import EngineCache, Templater, report_duplicate_key
 from qalib.translators.view import QalibView
 from qalib.translators.xml.embed import filter_tabs, XMLEmbedAdapter, XMLExpansiveEmbedAdapter
+from qalib.translators.xml.fragments import Fragments, split_fragments
 
 
 def get_text(element_tree: ElementTree.Element, child: str) -> Optional[str]:
@@ -46,6 +50,28 @@ def get_element(element_tree: ElementTree.Element, child: str) -> Optional[Eleme
     return None if (element := element_tree.find(child)) is None else element
 
 
+def index_elements(document: ElementTree.Element, report: bool = True) -> Dict[str, ElementTree.Element]:
+    """Builds an index of the top level elements of the document by their key, keeping the first element of every key.
+
+    Args:
+        document (ElementTree.Element): root of the document
+        report (bool): whether duplicate keys are reported with a warning
+
+    Returns (Dict[str, ElementTree.Element]): the elements of the document by their key
+    """
+    index: Dict[str, ElementTree.Element] = {}
+    for element in document:
+        key = XMLDeserializer.get_attribute(element, "key")
+        if key not in index:
+            index[key] = element
+        elif report:
+            report_duplicate_key(key)
+    return index
+
+
+_indices: WeakKeyDictionary[ElementTree.Element, Dict[str, ElementTree.Element]] = WeakKeyDictionary()
+
+
 class XMLTemplater(Templater):
     def __init__(self, source: str):
         """Initialisation of the XML Parser
@@ -54,6 +80,19 @@ class XMLTemplater(Templater):
             source (str): the text of the XML file
         """
         self.source = source
+        self._fragments: Optional[Fragments] = None
+        self._split = False
+
+    def _get_fragments(self) -> Optional[Fragments]:
+        """Splits the source into the fragments of its elements the first time that they are needed, so that
+        templaters that only template the document as a whole never parse it.
+
+        Returns (Optional[Fragments]): the fragments of the source, or None if it can not be split into its elements
+        """
+        if not self._split:
+            self._fragments = split_fragments(self.source)
+            self._split = True
+        return self._fragments
 
     def template(self, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
         """This method is used to template an element, by identifying it by its key and using the template engine to
@@ -67,15 +106,233 @@ class XMLTemplater(Templater):
         """
         return template_engine.template(self.source, keywords)
 
+    def template_key(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references. Documents that can not be split into their elements before templating, and elements that reference
+        pages by templated keys, are templated as a whole.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (str): templated document containing the element
+        """
+        if (fragments := self._get_fragments()) is None or (scoped := fragments.scope(key)) is None:
+            return self.template(template_engine, keywords)
+        return template_engine.template(scoped, keywords)
+
+    def preload(self, template_engine: TemplateEngine) -> None:
+        """This method is used to compile the source of every element ahead of the first render, or the whole
+        document if it can not be split into its elements.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is prepared for
+        """
+        if (fragments := self._get_fragments()) is None:
+            template_engine.compile(self.source)
+            return
+        documents = list(dict.fromkeys(fragments.scope(key) or self.source for key in fragments.elements))
+        template_engine.reserve(len(documents))
+        for document in documents:
+            template_engine.compile(document)
+
+    def template_document(
+        self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]
+    ) -> ElementTree.Element:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references, and hand it over to the deserializer as a parsed document.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (ElementTree.Element): root of the templated document
+        """
+        return ElementTree.fromstring(self.template_key(key, template_engine, keywords))
+
+
+class XMLTreeTemplater(Templater):
+    """Templater that parses the XML document once, and templates the text, tails and attribute values of the elements
+    on a copy for every render, which shares its static elements with the parsed document. As the markup is no longer
+    templated, control flow of template engines (such as a Jinja2 for loop that repeats elements) is not supported, and
+    these documents should use the XMLTemplater instead.
+    """
+
+    def __init__(self, source: str):
+        """Initialisation of the XML Parser
+
+        Args:
+            source (str): the text of the XML file
+        """
+        self.source = source
+        self._document = ElementTree.fromstring(source)
+        self._elements: Dict[str, ElementTree.Element] = index_elements(self._document)
+        self._static_nodes: EngineCache[Set[int]] = EngineCache(self._find_static_nodes)
+
+    def _scope(self, key: str) -> List[ElementTree.Element]:
+        """Retrieves the element identified by the key, along with the pages that it references. Pages that are
+        referenced by a key that is not the literal key of an element, such as a templated key, can only be found once
+        every element is templated, so every element is retrieved for them.
+
+        Args:
+            key (str): key of the element
+
+        Returns (List[ElementTree.Element]): the element, followed by the pages it references
+        """
+        if key not in self._elements:
+            raise KeyError("Key not found")
+        element = self._elements[key]
+        scoped = {key: element}
+        if (pages := element.find("pages")) is not None:
+            for page in pages.findall("page"):
+                if (page_key := XMLDeserializer.get_attribute(page, "key")) not in self._elements:
+                    return list(self._document)
+                scoped[page_key] = self._elements[page_key]
+        return list(scoped.values())
+
+    def _find_static_nodes(self, template_engine: TemplateEngine) -> Set[int]:
+        """Method that is used to find the elements and strings of the document that contain no template syntax for the
+        template engine, so that they are never sent through it.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is analysed for
+
+        Returns (Set[int]): identities of the static elements and strings
+        """
+        nodes: Set[int] = set()
+
+        def visit_text(text: Optional[str]) -> bool:
+            if text is None or template_engine.is_static(text):
+                nodes.add(id(text))
+                return True
+            return False
+
+        def visit(element: ElementTree.Element) -> bool:
+            static = all([visit(child) for child in element])
+            static = all([visit_text(value) for value in element.attrib.values()]) and static
+            static = all([visit_text(element.text), visit_text(element.tail)]) and static
+            if static:
+                nodes.add(id(element))
+            return static
+
+        visit(self._document)
+        return nodes
+
+    def template_element(
+        self, element: ElementTree.Element, template_engine: TemplateEngine, keywords: Dict[str, Any]
+    ) -> ElementTree.Element:
+        """Creates a copy of the element, with its text, tail and attribute values templated. Static elements are not
+        copied, and are shared with the parsed document.
+
+        Args:
+            element (ElementTree.Element): element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (ElementTree.Element): templated copy of the element, which must not be mutated
+        """
+        return self._template_element(element, template_engine, keywords, self._static_nodes.get(template_engine))
+
+    @classmethod
+    def _template_element(
+        cls,
+        element: ElementTree.Element,
+        template_engine: TemplateEngine,
+        keywords: Dict[str, Any],
+        static_nodes: Set[int],
+    ) -> ElementTree.Element:
+        if id(element) in static_nodes:
+            return element
+
+        def template_text(text: Optional[str]) -> Optional[str]:
+            if id(text) in static_nodes:
+                return text
+            return template_engine.template(cast(str, text), keywords)
+
+        templated = ElementTree.Element(
+            element.tag, {name: template_text(value) for name, value in element.attrib.items()}
+        )
+        templated.text = template_text(element.text)
+        templated.tail = template_text(element.tail)
+        templated.extend(cls._template_element(child, template_engine, keywords, static_nodes) for child in element)
+        return templated
+
+    def template(self, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+        """This method is used to template the whole document.
+
+        Args:
+            template_engine (TemplateEngine): template engine that is used to template the document
+            keywords (Dict[str, Any]): keywords that are used to template the document
+
+        Returns (str): templated document
+        """
+        return ElementTree.tostring(
+            self.template_element(self._document, template_engine, keywords), encoding="unicode"
+        )
+
+    def template_key(self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (str): templated document containing the element
+        """
+        return ElementTree.tostring(self.template_document(key, template_engine, keywords), encoding="unicode")
+
+    def preload(self, template_engine: TemplateEngine) -> None:
+        """This method is used to find the static elements of the document, and compile the text, tails and attribute
+        values of every other element ahead of the first render.
+
+        Args:
+            template_engine (TemplateEngine): template engine that the document is prepared for
+        """
+        static_nodes = self._static_nodes.get(template_engine)
+        documents: Dict[str, None] = {}
+        for element in self._document.iter():
+            for text in (*element.attrib.values(), element.text, element.tail):
+                if id(text) not in static_nodes:
+                    documents[cast(str, text)] = None
+        template_engine.reserve(len(documents))
+        for document in documents:
+            template_engine.compile(document)
+
+    def template_document(
+        self, key: str, template_engine: TemplateEngine, keywords: Dict[str, Any]
+    ) -> ElementTree.Element:
+        """This method is used to template only the element identified by the key, along with the pages that it
+        references, without parsing the document again.
+
+        Args:
+            key (str): key of the element that is templated
+            template_engine (TemplateEngine): template engine that is used to template the element
+            keywords (Dict[str, Any]): keywords that are used to template the element
+
+        Returns (ElementTree.Element): root of the templated document
+        """
+        document = ElementTree.Element(self._document.tag, self._document.attrib)
+        static_nodes = self._static_nodes.get(template_engine)
+        document.extend(
+            self._template_element(element, template_engine, keywords, static_nodes) for element in self._scope(key)
+        )
+        return document
+
 
 class XMLDeserializer(Deserializer[K_contra]):
     """Read and process the data given by the XML file, and use given user objects to render the text"""
 
-    def _get_element(self, document: ElementTree.Element, key: str) -> ElementTree.Element:
-        for element in document:
-            if key == self.get_attribute(element, "key"):
-                return element
-        raise KeyError("Key not found")
+    @staticmethod
+    def _get_element(document: ElementTree.Element, key: str) -> ElementTree.Element:
+        if (index := _indices.get(document)) is None:
+            index = _indices[document] = index_elements(document, report=False)
+        if key not in index:
+            raise KeyError("Key not found")
+        return index[key]
 
     def deserialize(
         self, source: str, key: K_contra, callables: Dict[str, Callback], events: EventCallbacks
@@ -90,10 +347,55 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         Returns (Message): message containing the embed and its view
         """
-        document = ElementTree.fromstring(source)
+        return self.deserialize_document(ElementTree.fromstring(source), key, callables, events)
+
+    def deserialize_document(
+        self,
+        document: str | ElementTree.Element,
+        key: K_contra,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> ReturnType:
+        """This method is used to deserialize the embed from a document that has already been parsed.
+
+        Args:
+            document (ElementTree.Element | str): root of the parsed document, or its raw string
+            key (K): key of the element
+            callables (Dict[str, Callback]): dictionary containing the callables to use for the components
+            events (EventCallbacks): dictionary containing the events to use for the components
+
+        Returns (ReturnType): all possible deserialized objects.
+        """
+        if isinstance(document, str):
+            return self.deserialize(document, key, callables, events)
         element = self._get_element(document, key)
         return self.deserialize_element(document, element, callables, events)
 
+    async def deserialize_document_async(
+        self,
+        document: str | ElementTree.Element,
+        key: K_contra,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> ReturnType:
+        """This method is used to deserialize the embed from a document, building menus cooperatively so that the
+        event loop is yielded to between their pages.
+
+        Args:
+            document (ElementTree.Element | str): root of the parsed document, or its raw string
+            key (K): key of the element
+            callables (Dict[str, Callback]): dictionary containing the callables to use for the components
+            events (EventCallbacks): dictionary containing the events to use for the components
+
+        Returns (ReturnType): the deserialized element
+        """
+        if isinstance(document, str):
+            document = ElementTree.fromstring(document)
+        element = self._get_element(document, key)
+        if ElementTypes.from_str(element.tag) == ElementTypes.MENU:
+            return await self.deserialize_menu_async(element, callables, events, document=document)
+        return self.deserialize_element(document, element, callables, events)
+
     def deserialize_element(
         self,
         document: ElementTree.Element,
@@ -126,14 +428,14 @@ class XMLDeserializer(Deserializer[K_contra]):
     def deserialize_expansive_into_menu(
         self, element: ElementTree.Element, callbacks: Dict[str, Callback], events: EventCallbacks
     ) -> Menu:
-        pages = self.deserialize_expansive(element, callbacks, events)
+        pages = self.deserialize_expansive_lazily(element, callbacks, events)
         timeout_element = element.find("timeout")
         timeout: Optional[float] = 180.0
         if timeout_element is not None:
             timeout = None if timeout_element.text is None else float(timeout_element.text)
 
         arrows: Dict[MenuActions, ButtonComponent] = self.deserialize_menu_arrows(element)
-        return Menu(pages, timeout, arrows, events)
+        return Menu(pages, timeout, arrows, events, single_view=self.get_attribute(element, "single_view") == "true")
 
     def deserialize_expansive(
         self, element: ElementTree.Element, callbacks: Dict[str, Callback], events: EventCallbacks
@@ -147,14 +449,37 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         Returns (List[Message]): A list of messages containing the embed and its view.
         """
+        return [page() for page in self.deserialize_expansive_lazily(element, callbacks, events)]
+
+    def deserialize_expansive_lazily(
+        self, element: ElementTree.Element, callbacks: Dict[str, Callback], events: EventCallbacks
+    ) -> List[PageThunk]:
+        """Splits an embed from an XML file into pages, which are only deserialized once they are called.
+
+        Args:
+            element (ElementTree.Element): templated document contents to deserialize.
+            callbacks (Dict[str, Callback]): A dictionary containing the callables to use for the components.
+            events (EventCallbacks): A dictionary containing the events to use for the components.
+
+        Returns (List[PageThunk]): A list of functions that deserialize the pages.
+        """
         raw_embed = element.find("embed")
         assert raw_embed is not None, "Embed not found"
 
         return [
-            self.deserialize_message(element, callbacks, events, embed=e)
-            for e in expand(XMLExpansiveEmbedAdapter(raw_embed, element.get("page_number_key")))
+            partial(self._deserialize_expansive_page, element, callbacks, events, embed)
+            for embed in expand_lazily(XMLExpansiveEmbedAdapter(raw_embed, element.get("page_number_key")))
         ]
 
+    def _deserialize_expansive_page(
+        self,
+        element: ElementTree.Element,
+        callbacks: Dict[str, Callback],
+        events: EventCallbacks,
+        embed: Callable[[], discord.Embed],
+    ) -> Message:
+        return self.deserialize_message(element, callbacks, events, embed=embed())
+
     def deserialize_menu_arrows(self, arrows_view: ElementTree.Element) -> Dict[MenuActions, ButtonComponent]:
         """Deserializes the arrows of a menu from an XML file, and returns it as a dictionary.
 
@@ -242,15 +567,26 @@ class XMLDeserializer(Deserializer[K_contra]):
         callables: Dict[str, Callback],
         events: EventCallbacks,
     ) -> List[Message]:
+        return [page() for page in self.deserialize_page_lazily(document, element, callables, events)]
+
+    def deserialize_page_lazily(
+        self,
+        document: ElementTree.Element,
+        element: ElementTree.Element,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> List[PageThunk]:
         if element.tag == "page":
             element = self._get_element(document, self.get_attribute(element, "key"))
         element_type = ElementTypes.from_str(element.tag)
 
         page_deserializers: Dict[
-            ElementTypes, Callable[[ElementTree.Element, Dict[str, Callback], EventCallbacks], List[Message]]
+            ElementTypes, Callable[[ElementTree.Element, Dict[str, Callback], EventCallbacks], List[PageThunk]]
         ] = {
-            ElementTypes.MESSAGE: lambda page, callback, m_events: [self.deserialize_message(page, callback, m_events)],
-            ElementTypes.EXPANSIVE: self.deserialize_expansive,
+            ElementTypes.MESSAGE: lambda page, callback, m_events: [
+                partial(self.deserialize_message, page, callback, m_events)
+            ],
+            ElementTypes.EXPANSIVE: self.deserialize_expansive_lazily,
         }
         assert element_type is not None, f"Element type {element.tag} not found"
         return page_deserializers[element_type](element, callables, events)
@@ -277,17 +613,76 @@ class XMLDeserializer(Deserializer[K_contra]):
         raw_pages = element.find("pages")
         assert raw_pages is not None, "pages is not present"
 
-        pages: List[Message] = sum([self.deserialize_page(document, page, callables, events) for page in raw_pages], [])
+        pages: List[PageThunk] = sum(
+            [self.deserialize_page_lazily(document, page, callables, events) for page in raw_pages], []
+        )
 
-        timeout_ele = element.find("timeout")
-        timeout = float(timeout_ele.text) if timeout_ele is not None and timeout_ele.text is not None else None
+        return Menu(pages, events=events, **self.deserialize_menu_options(element))
+
+    def deserialize_menu_options(self, element: ElementTree.Element) -> MenuOptions:
+        """Deserializes the options of a menu, which are shared by every way of building the menu.
 
+        Args:
+            element (ElementTree.Element): The XML Menu Element to deserialize.
+
+        Returns (MenuOptions): The timeout, arrows and single_view option of the menu.
+        """
+        timeout_ele = element.find("timeout")
         view = element.find("arrows")
-        if view is None:
-            return Menu(pages, timeout, events=events)
+        return {
+            "timeout": float(timeout_ele.text) if timeout_ele is not None and timeout_ele.text is not None else None,
+            "arrows": None if view is None else self.deserialize_menu_arrows(view),
+            "single_view": self.get_attribute(element, "single_view") == "true",
+        }
 
-        arrows: Dict[MenuActions, ButtonComponent] = self.deserialize_menu_arrows(view)
-        return Menu(pages, timeout, arrows, events)
+    async def deserialize_pages_async(
+        self,
+        document: ElementTree.Element,
+        raw_pages: ElementTree.Element,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+    ) -> AsyncIterator[PageThunk]:
+        """Splits the pages of a menu one at a time, yielding to the event loop after every page.
+
+        Args:
+            document (ElementTree.Element): The entire document
+            raw_pages (ElementTree.Element): The pages element of the menu
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the components.
+            events (EventCallbacks): A dictionary containing the events to callback on.
+
+        Returns (AsyncIterator[PageThunk]): The functions that deserialize the pages of the menu.
+        """
+        for raw_page in raw_pages:
+            for page in self.deserialize_page_lazily(document, raw_page, callables, events):
+                yield page
+            await asyncio.sleep(0)
+
+    async def deserialize_menu_async(
+        self,
+        element: ElementTree.Element,
+        callables: Dict[str, Callback],
+        events: EventCallbacks,
+        *,
+        document: ElementTree.Element,
+    ) -> Menu:
+        """Deserializes a menu from an XML file cooperatively, yielding to the event loop between its pages.
+
+        Args:
+            element (ElementTree.Element): The XML Menu Element to deserialize.
+            callables (Dict[str, Callback]): A dictionary containing the callables to use for the components.
+            events (EventCallbacks): A dictionary containing the events to callback on.
+            document (ElementTree.Element): The entire document
+
+        Returns (Menu): The menu.
+        """
+        raw_pages = element.find("pages")
+        assert raw_pages is not None, "pages is not present"
+
+        return await Menu.from_pages(
+            self.deserialize_pages_async(document, raw_pages, callables, events),
+            events=events,
+            **self.deserialize_menu_options(element),
+        )
 
     def deserialize_modal(
         self,
@@ -428,8 +823,10 @@ class XMLDeserializer(Deserializer[K_contra]):
         return "" if (value := element.get(attribute)) is None else value
 
     @staticmethod
+    @deprecated(version="2.5.15", reason="Use ElementTree.Element.find instead, as parsed documents are shared")
     def pop_component(component: ElementTree.Element, key: str) -> Optional[ElementTree.Element]:
-        """Pops a component from the given element, and returns it.
+        """Pops a component from the given element, and returns it. This mutates the element, which corrupts parsed
+        documents that are shared between renders, so the deserializer no longer uses it.
 
         Args:
             component (ElementTree.Element): The element to pop the component from.
@@ -466,15 +863,16 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         return emoji
 
-    def _extract_elements(self, tree: ElementTree.Element) -> Dict[str, Any]:
+    def _extract_elements(self, tree: ElementTree.Element, *excluded: str) -> Dict[str, Any]:
         """Extracts the elements from the given ElementTree.Element, and returns them as a dictionary.
 
         Args:
             tree (ElementTree.Element): The element to extract the elements from.
+            *excluded (str): The tags of the elements that are not extracted.
 
         Returns (Dict[str, Any]): A dictionary containing the extracted elements.
         """
-        return {element.tag: self.get_element_text(element) for element in tree}
+        return {element.tag: self.get_element_text(element) for element in tree if element.tag not in excluded}
 
     def _create_button_component(self, component: ElementTree.Element) -> ButtonComponent:
         """Creates a button component from the given element.
@@ -484,9 +882,8 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         Returns (ButtonComponent): The created button component.
         """
-        emoji_component = self.pop_component(component, "emoji")
-        attributes = self._extract_elements(component)
-        attributes["emoji"] = self._render_emoji(emoji_component)
+        attributes = self._extract_elements(component, "emoji")
+        attributes["emoji"] = self._render_emoji(component.find("emoji"))
         attributes["disabled"] = attributes["disabled"].lower() == "true" if "disabled" in attributes else False
 
         return cast(ButtonComponent, attributes)
@@ -516,9 +913,8 @@ class XMLDeserializer(Deserializer[K_contra]):
         """
         options = []
         for option in raw_options or []:
-            emoji_component = self.pop_component(option, "emoji")
-            option_attributes = self._extract_elements(option)
-            option_attributes["emoji"] = make_emoji(self._render_emoji(emoji_component))
+            option_attributes = self._extract_elements(option, "emoji")
+            option_attributes["emoji"] = make_emoji(self._render_emoji(option.find("emoji")))
             options.append(discord.SelectOption(**option_attributes))
         return options
 
@@ -535,10 +931,8 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         Returns (ui.Select): The rendered select.
         """
-        options = self._render_options(self.pop_component(component, "options"))
-
-        attributes = self._extract_elements(component)
-        attributes["options"] = options
+        attributes = self._extract_elements(component, "options")
+        attributes["options"] = self._render_options(component.find("options"))
         attributes["callback"] = callback
 
         select: ui.Select = create_select(**attributes)
@@ -554,9 +948,9 @@ class XMLDeserializer(Deserializer[K_contra]):
 
         Returns (ui.ChannelSelect): The rendered channel select.
         """
-        channel_types: Optional[ElementTree.Element] = self.pop_component(component, "channel_types")
+        channel_types: Optional[ElementTree.Element] = component.find("channel_types")
 
-        attributes = self._extract_elements(component)
+        attributes = self._extract_elements(component, "channel_types")
         if channel_types is not None:
             attributes["channel_types"] = make_channel_types(
                 [cast(ChannelType, self.get_element_text(channel)) for channel in channel_types.findall("channel_type")]
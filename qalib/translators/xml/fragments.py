@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Dict, List, Optional
+from xml.parsers import expat
+
+from qalib.translators.templater import report_duplicate_key
+
+__all__ = "Fragments", "split_fragments"
+
+
+@dataclasses.dataclass(frozen=True)
+class Fragments:
+    """Raw (untemplated) source of every top level element of an XML document, indexed by their key, so that an
+    element can be templated without templating the rest of the document."""
+
+    root_open: str
+    root_close: str
+    elements: Dict[str, str]
+    references: Dict[str, List[str]]
+
+    def scope(self, key: str) -> Optional[str]:
+        """Builds a document that only contains the element identified by the key, and the pages that it references.
+        Pages that are referenced by a key that is not the literal key of an element, such as a templated key, can only
+        be found once the whole document is templated, so no document is built for them.
+
+        Args:
+            key (str): key of the element
+
+        Returns (Optional[str]): raw source of the scoped document, or None if the whole document has to be templated
+        """
+        if key not in self.elements:
+            raise KeyError("Key not found")
+        pages = self.references.get(key, [])
+        if any(page not in self.elements for page in pages):
+            return None
+        keys = dict.fromkeys([key] + pages)
+        return self.root_open + "".join(self.elements[element_key] for element_key in keys) + self.root_close
+
+
+def _tag_end(source: bytes, start: int) -> int:
+    """Finds the end of the tag starting at the given index, ignoring any > that are within quoted attributes.
+
+    Args:
+        source (bytes): encoded source of the document
+        start (int): index of the < that opens the tag
+
+    Returns (int): index that is directly after the > that closes the tag
+    """
+    quote: Optional[int] = None
+    for index in range(start, len(source)):
+        char = source[index]
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in b"\"'":
+            quote = char
+        elif char == ord(">"):
+            return index + 1
+    raise ValueError("Unterminated tag")
+
+
+def split_fragments(source: str) -> Optional[Fragments]:
+    """Splits the raw source of an XML document into its top level elements. Documents that can not be split safely,
+    i.e. that are not well-formed before being templated, or that have content between the top level elements (such as
+    template control flow wrapping elements), return None so that they are templated as a whole.
+
+    Args:
+        source (str): raw source of the XML document
+
+    Returns (Optional[Fragments]): the fragments of the document, or None if it can not be split
+    """
+    if "<!DOCTYPE" in source:
+        return None
+
+    encoded = source.encode("utf-8")
+    parser = expat.ParserCreate()
+    depth = 0
+    scopable = True
+    root: List[int] = []
+    current: List[str] = []
+    start_index = 0
+    elements: Dict[str, str] = {}
+    references: Dict[str, List[str]] = {}
+
+    def start_element(tag: str, attributes: Dict[str, str]) -> None:
+        nonlocal depth, start_index, scopable
+        depth += 1
+        if depth == 1:
+            root.append(parser.CurrentByteIndex)
+        elif depth == 2:
+            start_index = parser.CurrentByteIndex
+            key = attributes.get("key")
+            if key is not None and key in elements:
+                report_duplicate_key(key)
+            if key is None or key in elements:
+                scopable = False
+            current[:] = [key or ""]
+        elif tag == "page" and "key" in attributes:
+            references.setdefault(current[0], []).append(attributes["key"])
+
+    def end_element(_: str) -> None:
+        nonlocal depth
+        if depth == 2:
+            index = parser.CurrentByteIndex
+            end = _tag_end(encoded, index if encoded.startswith(b"</", index) else start_index)
+            elements[current[0]] = encoded[start_index:end].decode("utf-8")
+        elif depth == 1:
+            root.append(parser.CurrentByteIndex)
+        depth -= 1
+
+    def character_data(data: str) -> None:
+        nonlocal scopable
+        if depth == 1 and data.strip():
+            scopable = False
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    try:
+        parser.Parse(encoded, True)
+    except expat.ExpatError:
+        return None
+
+    if not scopable or len(root) != 2 or not encoded.startswith(b"</", root[1]):
+        return None
+
+    return Fragments(
+        root_open=encoded[root[0] : _tag_end(encoded, root[0])].decode("utf-8"),
+        root_close=encoded[root[1] : _tag_end(encoded, root[1])].decode("utf-8"),
+        elements=elements,
+        references=references,
+    )
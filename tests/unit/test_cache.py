@@ -0,0 +1,266 @@
+import datetime
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List, cast
+
+from qalib.cache import CacheInfo, RenderCache, default_fingerprint
+from qalib.renderer import Renderer, RenderingOptions
+from qalib.template_engines.formatter import Formatter
+from qalib.translators import Message
+
+
+class CountingFormatter(Formatter):
+    """Formatter that counts the documents that it templates."""
+
+    def __init__(self) -> None:
+        self.documents: List[str] = []
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        self.documents.append(document)
+        return super().template(document, keywords)
+
+
+class Clock:
+    """Clock that only moves when it is told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests the cache of templated documents"""
+
+    def test_fingerprint(self):
+        self.assertEqual(default_fingerprint({"a": [1, {"b": {2}}]}), default_fingerprint({"a": [1, {"b": {2}}]}))
+        self.assertNotEqual(default_fingerprint({"a": [1]}), default_fingerprint({"a": (1,)}))
+        self.assertRaises(TypeError, default_fingerprint, {"a": bytearray()})
+
+    def test_fingerprint_types(self):
+        fingerprints = {default_fingerprint({"v": value}) for value in (1, True, 1.0)}
+        self.assertEqual(len(fingerprints), 3)
+        self.assertNotEqual(default_fingerprint({"v": [0]}), default_fingerprint({"v": [False]}))
+        self.assertIsNotNone(default_fingerprint({"v": datetime.datetime(2023, 1, 1)}))
+        self.assertRaises(TypeError, default_fingerprint, {"v": object()})
+
+    def test_unhashable_keywords(self):
+        cache: RenderCache[str] = RenderCache()
+        self.assertIsNone(cache.key("key", {"a": bytearray()}))
+        self.assertIsNotNone(cache.key("key", {"a": [1]}))
+
+    def test_custom_fingerprint(self):
+        cache: RenderCache[str] = RenderCache(fingerprint=lambda keywords: keywords["user"]["id"])
+        self.assertEqual(cache.key("key", {"user": {"id": 1, "name": "a"}}), cache.key("key", {"user": {"id": 1}}))
+
+    def test_lru(self):
+        cache: RenderCache[str] = RenderCache(maxsize=2)
+        first, second, third = (cache.key(key, {}) for key in "abc")
+        cache.put(first, "a")
+        cache.put(second, "b")
+        self.assertEqual(cache.get(first), "a")
+        cache.put(third, "c")
+        self.assertIsNone(cache.get(second))
+        self.assertEqual(cache.get(first), "a")
+        self.assertEqual(cache.cache_info(), CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, currsize=2))
+
+    def test_ttl(self):
+        clock = Clock()
+        cache: RenderCache[str] = RenderCache(ttl=10, clock=clock)
+        entry = cache.key("key", {})
+        cache.put(entry, "document")
+        clock.now = 9.5
+        self.assertEqual(cache.get(entry), "document")
+        clock.now = 10
+        self.assertIsNone(cache.get(entry))
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_invalidate(self):
+        cache: RenderCache[str] = RenderCache()
+        cache.put(cache.key("a", {"x": 1}), "1")
+        cache.put(cache.key("a", {"x": 2}), "2")
+        cache.put(cache.key("b", {}), "3")
+        cache.invalidate("a")
+        self.assertEqual(cache.cache_info().currsize, 1)
+        cache.invalidate()
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, RenderCache, maxsize=0)
+
+
+class TestCachedRenderer(unittest.IsolatedAsyncioTestCase):
+    """Tests that cached renderers skip templating and still return fresh messages"""
+
+    keywords = {"todays_date": datetime.datetime(2023, 1, 1, 12, 0, 0, 1)}
+
+    def test_hits(self):
+        for path in ("tests/routes/full_embeds.xml", "tests/routes/full_embeds.json"):
+            engine = CountingFormatter()
+            renderer: Renderer[str] = Renderer(engine, path, RenderingOptions.CACHE)
+            first = renderer.render("test_key2", keywords=self.keywords)
+            templated = len(engine.documents)
+            second = renderer.render("test_key2", keywords=self.keywords)
+            self.assertEqual(len(engine.documents), templated)
+            assert isinstance(first, Message) and isinstance(second, Message)
+            self.assertIsNot(first, second)
+            self.assertIsNot(first.embed, second.embed)
+            self.assertIsNot(first.view, second.view)
+            self.assertEqual(first.embed, second.embed)
+            cache = renderer.cache
+            assert cache is not None
+            self.assertEqual(cache.cache_info()[:2], (1, 1))
+
+    def test_keywords_miss(self):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/full_embeds.xml", RenderingOptions.CACHE)
+        renderer.render("test_key", keywords=self.keywords)
+        renderer.render("test_key", keywords={"todays_date": datetime.datetime(2024, 1, 1, 12, 0, 0, 1)})
+        cache = renderer.cache
+        assert cache is not None
+        self.assertEqual(cache.cache_info()[:2], (0, 2))
+
+    def test_equal_keywords_of_other_types(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"a": {"type": "message", "content": "v={v}"}}')
+            renderer: Renderer[str] = Renderer(Formatter(), path, RenderingOptions.CACHE)
+            contents = [cast(Message, renderer.render("a", keywords={"v": value})).content for value in (1, True, 1.0)]
+        self.assertEqual(contents, ["v=1", "v=True", "v=1.0"])
+
+    def test_file_changes_miss(self):
+        for options in ((), (RenderingOptions.PRE_TEMPLATE,)):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "document.xml")
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write('<discord><message key="a"><content>before {v}</content></message></discord>')
+                renderer: Renderer[str] = Renderer(Formatter(), path, RenderingOptions.CACHE, *options)
+                self.assertEqual(cast(Message, renderer.render("a", keywords={"v": 1})).content, "before 1")
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write('<discord><message key="a"><content>after! {v}</content></message></discord>')
+                if not options:
+                    renderer.reload()
+                self.assertEqual(cast(Message, renderer.render("a", keywords={"v": 1})).content, "after! 1")
+
+    def test_objects_skip_cache(self):
+        class Member:
+            def __init__(self, name: str) -> None:
+                self.name = name
+
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/full_embeds.xml", RenderingOptions.CACHE)
+        member = Member("before")
+        renderer.render("test_key", keywords={**self.keywords, "member": member})
+        member.name = "after"
+        renderer.render("test_key", keywords={**self.keywords, "member": member})
+        cache = renderer.cache
+        assert cache is not None
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_no_cache_by_default(self):
+        self.assertIsNone(Renderer(Formatter(), "tests/routes/full_embeds.xml").cache)
+
+    async def test_render_async(self):
+        engine = CountingFormatter()
+        renderer: Renderer[str] = Renderer(
+            engine, "tests/routes/full_embeds.xml", RenderingOptions.CACHE, RenderingOptions.OFFLOAD
+        )
+        await renderer.render_async("test_key", keywords=self.keywords)
+        templated = len(engine.documents)
+        renderer.render("test_key", keywords=self.keywords)
+        await renderer.render_async("test_key", keywords=self.keywords)
+        self.assertEqual(len(engine.documents), templated)
+        cache = renderer.cache
+        assert cache is not None
+        self.assertEqual(cache.cache_info()[:2], (2, 1))
+
+
+class FailingFormatter(Formatter):
+    """Formatter that fails once it is told to."""
+
+    def __init__(self) -> None:
+        self.fail = False
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        if self.fail:
+            raise KeyError("name")
+        return super().template(document, keywords)
+
+
+class TestStaleWhileRevalidate(unittest.IsolatedAsyncioTestCase):
+    """Tests that stale documents are served while they are templated again in the background"""
+
+    source = (
+        '<discord><message key="live"><content>{name}</content></message>'
+        '<message key="slow"><content>{name}</content></message></discord>'
+    )
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "dashboard.xml")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(self.source)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def renderer(self, engine: Formatter) -> Renderer[str]:
+        return Renderer(
+            engine,
+            self.path,
+            RenderingOptions.STALE_WHILE_REVALIDATE,
+            fingerprint=lambda keywords: (),
+            stale_after=3600,
+            stale_after_keys={"live": 0},
+        )
+
+    @staticmethod
+    def content(message: Any) -> str:
+        assert isinstance(message, Message)
+        return cast(str, message.content)
+
+    async def test_serves_stale(self):
+        renderer = self.renderer(Formatter())
+        self.assertEqual(renderer.staleness("live"), 0)
+        self.assertEqual(renderer.staleness("slow"), 3600)
+        self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "a"})), "a")
+        self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "b"})), "a")
+        await renderer.revalidated()
+        self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "c"})), "b")
+
+    async def test_fresh_documents_are_not_revalidated(self):
+        renderer = self.renderer(Formatter())
+        await renderer.render_async("slow", keywords={"name": "a"})
+        self.assertEqual(self.content(await renderer.render_async("slow", keywords={"name": "b"})), "a")
+        await renderer.revalidated()
+        self.assertEqual(self.content(await renderer.render_async("slow", keywords={"name": "c"})), "a")
+
+    async def test_failed_refresh(self):
+        engine = FailingFormatter()
+        renderer = self.renderer(engine)
+        await renderer.render_async("live", keywords={"name": "a"})
+        engine.fail = True
+        with self.assertLogs("qalib.renderer", "ERROR") as logs:
+            self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "b"})), "a")
+            await renderer.revalidated()
+        self.assertIn("'live'", logs.output[0])
+        self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "c"})), "a")
+        engine.fail = False
+        await renderer.revalidated()
+        self.assertEqual(self.content(await renderer.render_async("live", keywords={"name": "d"})), "c")
+
+    def test_without_event_loop(self):
+        renderer = self.renderer(Formatter())
+        self.assertEqual(self.content(renderer.render("live", keywords={"name": "a"})), "a")
+        self.assertEqual(self.content(renderer.render("live", keywords={"name": "b"})), "b")
+        self.assertEqual(self.content(renderer.render("slow", keywords={"name": "a"})), "a")
+        self.assertEqual(self.content(renderer.render("slow", keywords={"name": "b"})), "a")
+
+    def test_staleness(self):
+        options = RenderingOptions.STALE_WHILE_REVALIDATE
+        renderer: Renderer[str] = Renderer(
+            Formatter(), self.path, options, stale_after=5, stale_after_keys=[("live", 0)]
+        )
+        self.assertEqual(renderer.staleness("live"), 0)
+        self.assertEqual(renderer.staleness("slow"), 5)
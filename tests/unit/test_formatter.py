@@ -1,6 +1,6 @@
 import unittest
 
-from qalib.template_engines.formatter import Formatter
+from qalib.template_engines.formatter import Formatter, compile_format, split_field_name
 
 
 class TestFormatter(unittest.TestCase):
@@ -24,3 +24,45 @@ class TestFormatter(unittest.TestCase):
         formatter = Formatter()
         document = "Hello {w[0]}, This is a {t}"
         self.assertEqual(formatter.template(document, {}), "Hello {w[0]}, This is a {t}")
+
+    def test_spec(self):
+        formatter = Formatter()
+        self.assertEqual(formatter.template("{n:03d} {m:>3}", {"n": 7}), "007 {m:>3}")
+
+    def test_nested_spec(self):
+        formatter = Formatter()
+        self.assertEqual(formatter.template("{a:>{n}}", {"a": "x", "n": 3}), "  x")
+
+    def test_conversion(self):
+        formatter = Formatter()
+        self.assertEqual(formatter.template("{a!r} {b!r}", {"a": "x"}), "'x' {b!r}")
+
+    def test_escaped_braces(self):
+        formatter = Formatter()
+        self.assertEqual(formatter.template("{{a}} {a}", {"a": 1}), "{a} 1")
+
+    def test_index_chain(self):
+        k = type("K", (), {"a": {"b": [1, 2]}})()
+        formatter = Formatter()
+        self.assertEqual(formatter.template("{k.a[b][1]}", {"k": k}), "2")
+
+    def test_positional_field(self):
+        formatter = Formatter()
+        self.assertRaises(IndexError, formatter.template, "{0}", {})
+
+    def test_compiled_once(self):
+        document = "Compiled {once}"
+        self.assertIs(compile_format(document), compile_format(document))
+
+    def test_split_field_name(self):
+        self.assertEqual(split_field_name("a"), ("a", []))
+        self.assertEqual(split_field_name("0.x"), (0, [(True, "x")]))
+        self.assertEqual(
+            split_field_name("a.b[c][1].d"), ("a", [(True, "b"), (False, "c"), (False, 1), (True, "d")])
+        )
+        self.assertEqual(split_field_name("a[x.y]"), ("a", [(False, "x.y")]))
+
+    def test_malformed_field_name(self):
+        for field_name in ("a.", "a[]", "a[0]x", "a..b", "a[0"):
+            self.assertIsNone(split_field_name(field_name))
+        self.assertRaises(ValueError, Formatter().template, "{a.}", {"a": 1})
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImports(unittest.TestCase):
+    """Tests that the heavy dependencies are only imported once they are used"""
+
+    def test_emoji_tables_are_not_imported(self):
+        code = "import sys, qalib; print(' '.join(m for m in ('emoji', 'discord_emoji') if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
@@ -0,0 +1,55 @@
+import unittest
+
+from jinja2 import BaseLoader, Environment
+
+from qalib.template_engines.jinja2 import Jinja2, TemplateCache
+
+
+class TestJinja2(unittest.TestCase):
+    def test_template(self):
+        jinja = Jinja2()
+        self.assertEqual(jinja.template("Hello {{ w }}", {"w": "World"}), "Hello World")
+
+    def test_compiled_once(self):
+        jinja = Jinja2()
+        for name in ("World", "Planet"):
+            self.assertEqual(jinja.template("Hello {{ w }}", {"w": name}), f"Hello {name}")
+        info = jinja.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_shared_environment(self):
+        environment = Environment(loader=BaseLoader(), autoescape=True)
+        first, second = Jinja2(environment), Jinja2(environment)
+        first.template("{{ a }}", {"a": 1})
+        second.template("{{ a }}", {"a": 2})
+        self.assertIs(first.cache, second.cache)
+        self.assertEqual(second.cache_info().hits, 1)
+
+    def test_lru_eviction(self):
+        jinja = Jinja2(cache_size=2)
+        for document in ("{{ a }}", "{{ b }}", "{{ a }}", "{{ c }}", "{{ a }}", "{{ b }}"):
+            jinja.template(document, {})
+        info = jinja.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (2, 4, 2, 2))
+
+    def test_reserve(self):
+        environment = Environment(loader=BaseLoader(), autoescape=True)
+        cache = TemplateCache(environment)
+        cache.reserve(300)
+        self.assertEqual(cache.maxsize, 300)
+        bounded = TemplateCache(environment, 2)
+        bounded.reserve(4)
+        self.assertEqual(bounded.maxsize, 2)
+
+    def test_cache_disabled(self):
+        jinja = Jinja2(cache_size=0)
+        jinja.template("{{ a }}", {})
+        jinja.template("{{ a }}", {})
+        self.assertEqual(jinja.cache_info().currsize, 0)
+        self.assertEqual(jinja.cache_info().misses, 2)
+
+    def test_clear(self):
+        jinja = Jinja2()
+        jinja.template("{{ a }}", {})
+        jinja.cache.clear()
+        self.assertEqual(tuple(jinja.cache_info()), (0, 0, jinja.cache.maxsize, 0))
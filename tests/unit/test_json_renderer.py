@@ -1,6 +1,10 @@
 import asyncio
 import datetime
+import os
+import tempfile
 import unittest
+from functools import partial
+from typing import List
 
 import discord.ui
 import mock
@@ -10,6 +14,7 @@ from qalib.renderer import Renderer
 from qalib.template_engines.formatter import Formatter
 from qalib.translators import BaseMessage, Message
 from qalib.translators.menu import Menu, MenuEvents
+from qalib.translators.message_parsing import create_button
 from tests.unit.mocked_classes import MockedInteraction
 from tests.unit.types import FullEmbeds, SelectEmbeds, ErrorEmbeds, CompleteJSONMessages
 from tests.unit.utils import render_message
@@ -181,7 +186,10 @@ class TestJSONRenderer(unittest.TestCase):
                     for _ in range(3)]
         message = Menu(messages)
         assert isinstance(message.front, Message)
-        self.assertEqual(sum(len(m.view.children) for m in messages), 4)
+        self.assertEqual([len(m.view.children) for m in messages if m.view is not None], [1])
+        message.set_front_page(1)
+        assert isinstance(message.front, Message)
+        self.assertEqual([None if m.view is None else len(m.view.children) for m in messages], [0, 2, None])
 
     @mock.patch("asyncio.get_running_loop")
     @mock.patch("discord.interactions.InteractionResponse.edit_message", new_callable=AsyncMock)
@@ -203,12 +211,15 @@ class TestJSONRenderer(unittest.TestCase):
         self.assertEqual(menu.index, 0)
         self.assertEqual(len(menu), 3)
         assert isinstance(menu.front, Message)
-        self.assertEqual(sum(len(m.view.children) for m in messages), 4)
+        self.assertEqual(sum(len(m.view.children) for m in messages if m.view is not None), 1)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        task = loop.create_task(messages[0].view.children[0].callback(MockedInteraction()))
+        arrow = messages[0].view.children[0]
+        task = loop.create_task(arrow.callback(MockedInteraction()))
         loop.run_until_complete(task)
         self.assertTrue(called)
+        self.assertEqual([None if m.view is None else len(m.view.children) for m in messages], [0, 2, None])
+        self.assertIs(messages[1].view.children[1], arrow)
 
     @mock.patch("asyncio.get_running_loop")
     @mock.patch("discord.interactions.InteractionResponse.edit_message", new_callable=AsyncMock)
@@ -233,6 +244,24 @@ class TestJSONRenderer(unittest.TestCase):
         menu = Menu(messages)
         self.assertEqual(menu[3].content, "3")
 
+    @mock.patch("asyncio.get_running_loop")
+    @mock.patch("discord.interactions.InteractionResponse.edit_message", new_callable=AsyncMock)
+    def test_menu_page_retrieval_leaves_shown_page(self, edit_message: mock.mock.AsyncMock, _: mock.mock.MagicMock):
+        for single_view in (False, True):
+            messages = [Message(content=str(_), embed=None, embeds=None, file=None, files=None, view=None, tts=None,
+                                ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                                delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+                        for _ in range(5)]
+            menu = Menu(messages, single_view=single_view)
+            view = menu.front.view
+            assert view is not None
+            children = list(view.children)
+            self.assertEqual(menu[3].content, "3")
+            self.assertEqual(view.children, children)
+            asyncio.run(view.children[-1].callback(MockedInteraction()))
+            self.assertEqual(menu.index, 1)
+            self.assertEqual(edit_message.call_args.kwargs["content"], "1")
+
     @mock.patch("asyncio.get_running_loop")
     @mock.patch("discord.interactions.InteractionResponse.edit_message", new_callable=AsyncMock)
     def test_menu_current_page_retrieval(self, mock_response: mock.mock.MagicMock, mock_view: mock.mock.MagicMock):
@@ -265,13 +294,151 @@ class TestJSONRenderer(unittest.TestCase):
         self.assertEqual(menu.index, 0)
         self.assertEqual(len(menu), 4)
         assert isinstance(menu.front, Message)
-        self.assertEqual(sum(len(m.view.children) for m in messages), 6)
+        self.assertEqual(sum(len(m.view.children) for m in messages if m.view is not None), 1)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         task = loop.create_task(messages[0].view.children[0].callback(MockedInteraction()))
         loop.run_until_complete(task)
         self.assertTrue(called)
 
+    @mock.patch("asyncio.get_running_loop")
+    def test_menu_arrows_are_created_once(self, mock_view: mock.mock.MagicMock):
+        messages = [Message(content=str(_), embed=None, embeds=None, file=None, files=None, view=None, tts=None,
+                            ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                            delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+                    for _ in range(200)]
+
+        with mock.patch("qalib.translators.menu.create_button", wraps=create_button) as created:
+            menu = Menu(messages)
+            created.assert_not_called()
+            for index in (0, 100, 199):
+                menu.set_front_page(index)
+                assert isinstance(menu.front, Message)
+            self.assertEqual(created.call_count, 2)
+        self.assertEqual(sum(1 for m in messages if m.view is not None), 3)
+        self.assertEqual(len(messages[199].view.children), 1)
+
+    @mock.patch("asyncio.get_running_loop")
+    def test_menu_renders_pages_lazily(self, mock_view: mock.mock.MagicMock):
+        rendered: List[int] = []
+
+        def page(index: int) -> Message:
+            rendered.append(index)
+            return Message(content=str(index), embed=None, embeds=None, file=None, files=None, view=None, tts=None,
+                           ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                           delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+
+        menu = Menu([partial(page, index) for index in range(50)], cache_size=2)
+        self.assertEqual(rendered, [])
+        self.assertEqual(menu.front.content, "0")
+        self.assertEqual(menu[1].content, "1")
+        self.assertIs(menu[0], menu.front)
+        self.assertEqual(rendered, [0, 1])
+        self.assertEqual(menu[2].content, "2")
+        self.assertEqual(menu[-1].content, "49")
+        self.assertEqual(rendered, [0, 1, 2, 49])
+        self.assertEqual(menu.current_page().content, "0")
+        self.assertEqual(rendered, [0, 1, 2, 49])
+        self.assertEqual(menu[1].content, "1")
+        self.assertEqual(rendered, [0, 1, 2, 49, 1])
+
+    @mock.patch("asyncio.get_running_loop")
+    def test_expansive_message_is_rendered_lazily(self, mock_view: mock.mock.MagicMock):
+        renderer: Renderer[CompleteJSONMessages] = Renderer(Formatter(), "tests/routes/menus.json")
+        with mock.patch("qalib.translators.json.JSONDeserializer.deserialize_message", autospec=True) as deserialize:
+            menu = renderer.render("menu4", events={})
+            assert isinstance(menu, Menu)
+            deserialize.assert_not_called()
+            self.assertGreater(len(menu), 1)
+            menu.front  # pylint: disable=pointless-statement
+            deserialize.assert_called_once()
+
+    @mock.patch("asyncio.get_running_loop")
+    @mock.patch("discord.interactions.InteractionResponse.edit_message", new_callable=AsyncMock)
+    def test_menu_single_view(self, edit_message: mock.mock.AsyncMock, mock_view: mock.mock.MagicMock):
+        messages = [Message(content=str(_), embed=None, embeds=None, file=None, files=None, view=None, tts=None,
+                            ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                            delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+                    for _ in range(3)]
+        messages[1].view = discord.ui.View()
+        button = discord.ui.Button(label="page")
+        messages[1].view.add_item(button)
+
+        menu = Menu(messages, single_view=True)
+        front = menu.front
+        view = front.view
+        assert view is not None
+        self.assertEqual([item.disabled for item in view.children], [True, False])
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(view.children[1].callback(MockedInteraction()))
+        self.assertEqual(menu.index, 1)
+        self.assertEqual(edit_message.call_args.kwargs["content"], "1")
+        self.assertIs(edit_message.call_args.kwargs["view"], view)
+        self.assertEqual(view.children[0], button)
+        self.assertEqual([item.disabled for item in view.children[1:]], [False, False])
+
+        loop.run_until_complete(view.children[2].callback(MockedInteraction()))
+        self.assertIs(menu.current_page().view, view)
+        self.assertEqual(len(view.children), 2)
+        self.assertEqual([item.disabled for item in view.children], [False, True])
+        self.assertEqual([message.view for message in messages[::2]], [None, None])
+
+    @mock.patch("asyncio.get_running_loop")
+    def test_menu_single_view_reserves_arrow_row(self, mock_view: mock.mock.MagicMock):
+        def page(*buttons: discord.ui.Button) -> Message:
+            view = discord.ui.View()
+            for button in buttons:
+                view.add_item(button)
+            return Message(content="page", embed=None, embeds=None, file=None, files=None, view=view, tts=None,
+                           ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                           delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+
+        full = page(*(discord.ui.Button(label=str(_)) for _ in range(20)))
+        menu = Menu([full, page()], single_view=True)
+        view = menu.front.view
+        assert view is not None
+        self.assertEqual(len(view.children), 22)
+        self.assertEqual({item.row for item in view.children[20:]}, {4})
+
+        self.assertRaises(ValueError, Menu, [page(*(discord.ui.Button() for _ in range(21)))], single_view=True)
+        self.assertRaises(ValueError, Menu, [page(discord.ui.Button(row=4))], single_view=True)
+
+        menu = Menu([page, partial(page, discord.ui.Button(row=4))], single_view=True)
+        view = menu.front.view
+        assert view is not None
+        self.assertRaises(ValueError, asyncio.run, view.children[-1].callback(MockedInteraction()))
+        self.assertIs(menu.current_page().view, view)
+
+    @mock.patch("asyncio.get_running_loop")
+    def test_menu_single_view_defers_checks_to_page(self, mock_view: mock.mock.MagicMock):
+        page_view = discord.ui.View()
+        page_view.interaction_check = AsyncMock(return_value=False)
+        message = Message(content="page", embed=None, embeds=None, file=None, files=None, view=page_view, tts=None,
+                          ephemeral=None, allowed_mentions=None, suppress_embeds=None, silent=None,
+                          delete_after=None, mention_author=None, nonce=None, reference=None, stickers=None)
+        view = Menu([message], single_view=True).front.view
+        assert view is not None
+        interaction = MockedInteraction()
+        self.assertFalse(asyncio.run(view.interaction_check(interaction)))
+        page_view.interaction_check.assert_awaited_once_with(interaction)
+
+    def test_single_view_from_document(self):
+        source = '{"menu": {"type": "menu", "single_view": true, "pages": [{"type": "message", "content": "a"}, ' \
+                 '{"type": "message", "content": "b"}]}}'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menus.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(source)
+            menu = Renderer(Formatter(), path).render("menu")
+        assert isinstance(menu, Menu)
+        self.assertIsNone(menu[0].view)
+        view = menu.front.view
+        self.assertIsNotNone(view)
+        self.assertIs(menu[0].view, view)
+        self.assertIsNone(menu[1].view)
+
     def test_allowed_mentions_rendering(self):
         template = "tests/routes/complete_messages.json"
 
@@ -0,0 +1,49 @@
+import unittest
+from typing import List
+
+import discord
+from discord import ui
+
+from qalib.translators.message_parsing import create_button, create_select, create_text_input, create_type_select
+from tests.unit.mocked_classes import MockedInteraction
+
+
+class Clicks:
+    """Records the items that its bound callback is called with."""
+
+    def __init__(self) -> None:
+        self.items: List[ui.Item] = []
+
+    async def on_click(self, item: ui.Item, _: discord.Interaction) -> None:
+        self.items.append(item)
+
+
+class TestCallbackItems(unittest.IsolatedAsyncioTestCase):
+    """Tests that items with callbacks share a single subclass of their item type"""
+
+    async def test_shared_subclass(self):
+        first, second = Clicks(), Clicks()
+        button = create_button({"custom_id": "a", "callback": first.on_click})
+        other = create_button({"custom_id": "b", "callback": second.on_click})
+        self.assertIs(type(button), type(other))
+        self.assertIsInstance(button, ui.Button)
+        self.assertEqual(type(button).__name__, ui.Button.__name__)
+        await button.callback(MockedInteraction())
+        self.assertEqual((first.items, second.items), ([button], []))
+
+    def test_without_callback(self):
+        self.assertIs(type(create_button({"custom_id": "a"})), ui.Button)
+        self.assertIs(type(create_select(custom_id="a")), ui.Select)
+
+    def test_item_types(self):
+        clicks = Clicks()
+        items = [
+            create_select(custom_id="a", callback=clicks.on_click),
+            create_type_select(ui.RoleSelect, custom_id="b", callback=clicks.on_click),
+            create_type_select(ui.UserSelect, custom_id="c", callback=clicks.on_click),
+            create_text_input({"label": "d", "callback": clicks.on_click}),
+        ]
+        for item, base in zip(items, (ui.Select, ui.RoleSelect, ui.UserSelect, ui.TextInput)):
+            self.assertIsInstance(item, base)
+        self.assertEqual(len({type(item) for item in items}), 4)
+        self.assertIs(type(items[1]), type(create_type_select(ui.RoleSelect, callback=clicks.on_click)))
@@ -1,5 +1,6 @@
 import datetime
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 
 import discord
@@ -39,6 +40,23 @@ class TestEmbedManager(unittest.IsolatedAsyncioTestCase):
         await context.display("Launch")
         args[0].assert_called_once()
 
+    async def test_xml_context_offloaded(self, *args: mock.mock.MagicMock):
+        context: QalibContext[SimpleEmbeds] = QalibContext(
+            self.ctx, Renderer(Formatter(), "tests/routes/simple_embeds.xml", RenderingOptions.OFFLOAD)
+        )
+        await context.display("Launch")
+        args[0].assert_called_once()
+
+    async def test_xml_context_offload_call(self, *args: mock.mock.MagicMock):
+        context: QalibContext[SimpleEmbeds] = QalibContext(
+            self.ctx, Renderer(Formatter(), "tests/routes/simple_embeds.xml")
+        )
+        with mock.patch.object(Renderer, "render_async", autospec=True, side_effect=Renderer.render_async) as render:
+            await context.display("Launch", offload=True)
+            await context.rendered_send("Launch")
+        self.assertEqual([call.kwargs["offload"] for call in render.call_args_list], [True, None])
+        self.assertEqual(args[0].call_count, 2)
+
     async def test_menu_in_context(self, *args: mock.mock.MagicMock):
         context: QalibContext[Menus] = QalibContext(
             self.ctx, Renderer(Formatter(), "tests/routes/menus.xml")
@@ -368,6 +386,20 @@ class TestEmbedManager(unittest.IsolatedAsyncioTestCase):
             )
         )
 
+    async def test_decorator_renderer_arguments(self, *_: mock.mock.MagicMock):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+
+            @qalib_context(Formatter(), "tests/routes/simple_embeds.json", RenderingOptions.OFFLOAD, executor=executor)
+            async def test(ctx: QalibContext[SimpleEmbeds]):
+                self.assertIs(ctx._renderer._executor, executor)  # pylint: disable=protected-access
+                await ctx.display("Launch")
+
+            await test(
+                discord.ext.commands.Context(
+                    message=cast(discord.message.Message, MessageMocked()), bot=BotMocked(), view=StringView("")
+                )
+            )
+
     async def test_cog_decorator(self, *_: mock.mock.MagicMock):
         test_obj = self
 
@@ -0,0 +1,182 @@
+import gc
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+from unittest import mock
+
+from jinja2 import BaseLoader, Environment
+
+from qalib.registry import Registry
+from qalib.renderer import Renderer, RenderingOptions, warmup
+from qalib.template_engines.formatter import Formatter
+from qalib.template_engines.jinja2 import Jinja2
+from qalib.translators import Message
+from qalib.translators.factory import TemplaterFactory
+
+
+class TestRegistry(unittest.TestCase):
+    """Tests the process-wide registry of documents and renderers"""
+
+    def test_templater_is_interned(self):
+        registry = Registry()
+        first = registry.templater("tests/routes/simple_embeds.xml")
+        self.assertIs(first, registry.templater(os.path.abspath("tests/routes/simple_embeds.xml")))
+        self.assertIsNot(first, registry.templater("tests/routes/simple_embeds.xml", parse_once=True))
+
+    def test_templater_is_parsed_again_when_file_changes(self):
+        file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8")
+        with file:
+            file.write('{"a": {"type": "message"}}')
+        try:
+            registry = Registry()
+            first = registry.templater(file.name)
+            with open(file.name, "w", encoding="utf-8") as rewritten:
+                rewritten.write('{"a": {"type": "message", "content": "changed"}}')
+            self.assertIsNot(first, registry.templater(file.name))
+        finally:
+            os.remove(file.name)
+
+    def test_source_is_interned(self):
+        registry = Registry()
+        path = "tests/routes/simple_embeds.xml"
+        self.assertIs(registry.source(path), registry.source(path))
+        self.assertIsNot(registry.source(path), registry.source(path, in_memory=True))
+
+    def test_renderers_are_not_shared(self):
+        path = "tests/routes/simple_embeds.xml"
+        first: Renderer[str] = Renderer(Formatter(), path, RenderingOptions.CACHE)
+        second: Renderer[str] = Renderer(Formatter(), path, RenderingOptions.CACHE)
+        self.assertIsNot(first.cache, second.cache)
+        self.assertIsNot(first.costs, second.costs)
+        self.assertIs(first._parser, second._parser)  # pylint: disable=protected-access
+
+    def test_renderers_share_parsed_document(self):
+        path = "tests/routes/simple_embeds.json"
+        first: Renderer[str] = Renderer(Formatter(), path)
+        second: Renderer[str] = Renderer(Jinja2(), path)
+        self.assertIs(first._parser, second._parser)  # pylint: disable=protected-access
+
+    def test_renderer_is_reloaded_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"a": {"type": "message", "content": "before"}}')
+            renderer: Renderer[str] = Renderer(Formatter(), path)
+            self.assertEqual(cast(Message, renderer.render("a")).content, "before")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"a": {"type": "message", "content": "after!"}}')
+            self.assertEqual(cast(Message, renderer.render("a")).content, "before")
+            renderer.reload()
+            self.assertEqual(cast(Message, renderer.render("a")).content, "after!")
+
+    def test_renders_without_checking_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"a": {"type": "message", "content": "{v}"}}')
+            renderer: Renderer[str] = Renderer(Formatter(), path, RenderingOptions.CACHE)
+            os.remove(path)
+            with mock.patch("qalib.renderer.stamp") as stamped:
+                for value in range(3):
+                    self.assertEqual(cast(Message, renderer.render("a", keywords={"v": value})).content, str(value))
+                stamped.assert_not_called()
+
+    def test_registered_renderers(self):
+        registry = Registry()
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/simple_embeds.xml")
+        registry.register(renderer)
+        self.assertEqual(registry.renderers(), [renderer])
+        del renderer
+        gc.collect()
+        self.assertEqual(registry.renderers(), [])
+
+
+class TestLazyRenderer(unittest.TestCase):
+    """Tests that lazy renderers defer loading the document until the first render"""
+
+    def test_defers_loading(self):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/not_a_file.xml", RenderingOptions.LAZY)
+        self.assertRaises(FileNotFoundError, renderer.render, "key")
+
+    def test_renders(self):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/simple_embeds.xml", RenderingOptions.LAZY)
+        self.assertIsInstance(renderer.render("Launch"), Message)
+
+    def test_loads_once(self):
+        with mock.patch("qalib.renderer.registry") as registry:
+            registry.templater.return_value = TemplaterFactory.get_templater("tests/routes/simple_embeds.xml")
+            renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/simple_embeds.xml", RenderingOptions.LAZY)
+            registry.templater.assert_not_called()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: renderer.render("Launch"), range(32)))
+            registry.templater.assert_called_once()
+
+
+class TestWarmup(unittest.TestCase):
+    """Tests the preloading of renderers ahead of the first render"""
+
+    def test_preload_compiles(self):
+        sources = {
+            ".xml": '<discord><message key="a"><content>Hello {{ name }}</content></message></discord>',
+            ".json": '{"a": {"type": "message", "content": "Hello {{ name }}"}}',
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, options in (
+                (".xml", ()),
+                (".xml", (RenderingOptions.PARSE_ONCE,)),
+                (".json", ()),
+                (".xml", (RenderingOptions.PRE_TEMPLATE, RenderingOptions.SINGLE_PASS)),
+            ):
+                path = os.path.join(directory, f"document{extension}")
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(sources[extension])
+                engine = Jinja2()
+                renderer: Renderer[str] = Renderer(engine, path, RenderingOptions.LAZY, *options)
+                renderer.preload()
+                self.assertGreater(engine.cache_info().currsize, 0)
+                misses = engine.cache_info().misses
+                renderer.render("a", keywords={"name": "World"})
+                self.assertEqual(engine.cache_info().misses, misses)
+
+    def test_preload_reserves_template_cache(self):
+        keys = [str(index) for index in range(4)]
+        sources = {
+            "document.json": json.dumps({key: {"type": "message", "content": f"{{{{ n{key} }}}}"} for key in keys}),
+            "document.xml": "<discord>"
+            + "".join(f'<message key="{key}"><content>{{{{ m{key} }}}}</content></message>' for key in keys)
+            + "</discord>",
+        }
+        engine = Jinja2(Environment(loader=BaseLoader(), autoescape=True))
+        bounded = Jinja2(Environment(loader=BaseLoader(), autoescape=True), cache_size=2)
+        with tempfile.TemporaryDirectory() as directory:
+            for name, source in sources.items():
+                path = os.path.join(directory, name)
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(source)
+                renderer: Renderer[str] = Renderer(engine, path, RenderingOptions.PARSE_ONCE)
+                renderer.preload()
+                misses = engine.cache_info().misses
+                for key in keys:
+                    renderer.render(key)
+                self.assertEqual(engine.cache_info().misses, misses)
+                Renderer(bounded, path, RenderingOptions.PARSE_ONCE).preload()
+                self.assertEqual(bounded.cache_info().maxsize, 2)
+
+    def test_warmup_registered_renderers(self):
+        engine = Jinja2()
+        renderer: Renderer[str] = Renderer(engine, "tests/routes/simple_embeds.json", RenderingOptions.LAZY)
+        with mock.patch.object(Renderer, "preload", autospec=True) as preload:
+            warmup()
+        self.assertIn(mock.call(renderer), preload.call_args_list)
+
+    def test_warmup_paths(self):
+        with mock.patch("qalib.renderer.registry") as registry:
+            registry.renderers.return_value = []
+            warmup(["tests/routes/simple_embeds.xml", "tests/routes/simple_embeds.xml"])
+        registry.templater.assert_called_once_with(os.path.abspath("tests/routes/simple_embeds.xml"))
+
+    def test_warmup_raises(self):
+        self.assertRaises(FileNotFoundError, warmup, ["tests/routes/not_a_file.xml"])
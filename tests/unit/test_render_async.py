@@ -0,0 +1,309 @@
+import asyncio
+import datetime
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from unittest import mock
+
+import discord
+
+from qalib.offload import CostEstimate, CostTracker
+from qalib.renderer import Renderer, RenderingOptions
+from qalib.template_engines.formatter import Formatter
+from qalib.translators import Message
+from qalib.translators.factory import DeserializerFactory, TemplaterFactory
+from qalib.translators.menu import Menu, MenuEvents, VirtualMenu
+from qalib.translators.view import ViewEvents
+from tests.unit.mocked_classes import MockedInteraction
+
+
+class ThreadRecordingFormatter(Formatter):
+    """Formatter that records the threads that it templates on."""
+
+    def __init__(self) -> None:
+        self.threads: List[threading.Thread] = []
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        self.threads.append(threading.current_thread())
+        return super().template(document, keywords)
+
+
+class TestRenderAsync(unittest.IsolatedAsyncioTestCase):
+    """Tests the rendering of documents without blocking the event loop"""
+
+    path = "tests/routes/full_embeds.xml"
+    keywords = {"todays_date": datetime.datetime.now()}
+
+    def setUp(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qalib-test")
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def offloaded(self, engine: ThreadRecordingFormatter) -> bool:
+        self.assertTrue(engine.threads)
+        return all(thread is not threading.current_thread() for thread in engine.threads)
+
+    async def test_inline_by_default(self):
+        engine = ThreadRecordingFormatter()
+        renderer: Renderer[str] = Renderer(engine, self.path, executor=self.executor)
+        message = await renderer.render_async("test_key", keywords=self.keywords)
+        self.assertIsInstance(message, Message)
+        self.assertFalse(self.offloaded(engine))
+
+    async def test_offload_renderer(self):
+        engine = ThreadRecordingFormatter()
+        renderer: Renderer[str] = Renderer(engine, self.path, RenderingOptions.OFFLOAD, executor=self.executor)
+        message = await renderer.render_async("test_key", keywords=self.keywords)
+        self.assertIsInstance(message, Message)
+        self.assertTrue(self.offloaded(engine))
+
+    async def test_offload_keys(self):
+        engine = ThreadRecordingFormatter()
+        renderer: Renderer[str] = Renderer(engine, self.path, executor=self.executor, offload_keys=["test_key"])
+        self.assertTrue(renderer.offloads("test_key"))
+        self.assertFalse(renderer.offloads("test_key2"))
+        await renderer.render_async("test_key", keywords=self.keywords)
+        self.assertTrue(self.offloaded(engine))
+        engine.threads.clear()
+        await renderer.render_async("test_key2", keywords=self.keywords)
+        self.assertFalse(self.offloaded(engine))
+
+    async def test_offload_call(self):
+        engine = ThreadRecordingFormatter()
+        renderer: Renderer[str] = Renderer(engine, self.path)
+        message = await renderer.render_async("test_key2", keywords=self.keywords, offload=True)
+        assert isinstance(message, Message)
+        self.assertIsNotNone(message.view)
+        self.assertTrue(self.offloaded(engine))
+
+
+class SlowFormatter(ThreadRecordingFormatter):
+    """Formatter that takes a while to template the documents that contain a marker."""
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        if "slow" in document:
+            time.sleep(0.01)
+        return super().template(document, keywords)
+
+
+class TestAdaptiveOffload(unittest.IsolatedAsyncioTestCase):
+    """Tests that adaptive renderers only offload the keys that are expensive to template"""
+
+    source = (
+        '<discord><message key="fast"><content>{name}</content></message>'
+        '<message key="slow"><content>slow {name}</content></message></discord>'
+    )
+
+    def test_moving_average(self):
+        tracker: CostTracker[str] = CostTracker(latency_threshold=0.5, smoothing=0.5)
+        self.assertIsNone(tracker.estimate("key"))
+        tracker.record("key", 1.0)
+        tracker.record("key", 0.0)
+        self.assertEqual(tracker.estimate("key"), CostEstimate(0.5, 2, False))
+        tracker.record("key", 1.0)
+        self.assertEqual(tracker.estimate("key"), CostEstimate(0.75, 3, True))
+        tracker.latency_threshold = 1.0
+        self.assertFalse(tracker.is_expensive("key"))
+        self.assertEqual(tracker.estimates(), {"key": CostEstimate(0.75, 3, False)})
+
+    def test_invalid_smoothing(self):
+        self.assertRaises(ValueError, CostTracker, smoothing=0)
+
+    async def test_adaptive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.xml")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(self.source)
+            engine = SlowFormatter()
+            renderer: Renderer[str] = Renderer(engine, path, RenderingOptions.ADAPTIVE, latency_threshold=0.005)
+            for key in ("fast", "slow"):
+                self.assertFalse(renderer.offloads(key))
+                await renderer.render_async(key, keywords={"name": "x"})
+            self.assertFalse(renderer.offloads("fast"))
+            self.assertTrue(renderer.offloads("slow"))
+            self.assertEqual(set(renderer.costs.estimates()), {"fast", "slow"})
+
+            engine.threads.clear()
+            await renderer.render_async("slow", keywords={"name": "x"})
+            self.assertNotIn(threading.current_thread(), engine.threads)
+            engine.threads.clear()
+            await renderer.render_async("fast", keywords={"name": "x"})
+            self.assertEqual(engine.threads, [threading.current_thread()])
+
+    def test_costs_without_adaptive(self):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/simple_embeds.xml", latency_threshold=0)
+        renderer.render("Launch")
+        self.assertTrue(renderer.costs.is_expensive("Launch"))
+        self.assertFalse(renderer.offloads("Launch"))
+
+
+class TestCooperativeMenus(unittest.IsolatedAsyncioTestCase):
+    """Tests that menus are built without blocking the event loop"""
+
+    paths = "tests/routes/menus.json", "tests/routes/menus.xml"
+
+    async def test_same_as_render(self):
+        for path in self.paths:
+            renderer: Renderer[str] = Renderer(Formatter(), path)
+            for key in ("Menu1", "Menu2", "Menu3"):
+                expected = renderer.render(key)
+                menu = await renderer.render_async(key)
+                assert isinstance(expected, Menu) and isinstance(menu, Menu)
+                self.assertEqual(len(menu), len(expected))
+                for index in range(len(menu)):
+                    expected.set_front_page(index)
+                    menu.set_front_page(index)
+                    expected_view, view = expected.front.view, menu.front.view
+                    assert expected_view is not None and view is not None
+                    self.assertEqual(view.timeout, expected_view.timeout)
+                    self.assertEqual(
+                        [item.label for item in view.children if isinstance(item, discord.ui.Button)],
+                        [item.label for item in expected_view.children if isinstance(item, discord.ui.Button)],
+                    )
+
+    async def test_same_options_as_render(self):
+        sources = {
+            ".json": '{"a": {"type": "message", "content": "a"}, "m": {"type": "menu", "pages": ["a", "a"], '
+            '"timeout": 5, "single_view": true}}',
+            ".xml": '<discord><message key="a"><content>a</content></message><menu key="m" single_view="true">'
+            '<timeout>5</timeout><pages><page key="a"/><page key="a"/></pages></menu></discord>',
+        }
+        for extension, source in sources.items():
+            deserializer = DeserializerFactory.get_deserializer(f"test{extension}")
+            templater = TemplaterFactory.get_templater(f"test{extension}", source=source)
+            document = templater.template_document("m", Formatter(), {})
+            expected = deserializer.deserialize_document(document, "m", {}, {})
+            menu = await deserializer.deserialize_document_async(document, "m", {}, {})
+            assert isinstance(expected, Menu) and isinstance(menu, Menu)
+            for attribute in ("_timeout", "_arrows", "_single_view"):
+                self.assertEqual(getattr(menu, attribute), getattr(expected, attribute))
+            self.assertTrue(menu._single_view)  # pylint: disable=protected-access
+
+    async def test_yields_between_pages(self):
+        progress: List[int] = []
+
+        async def tick() -> None:
+            while True:
+                progress.append(len(progress))
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        before = len(progress)
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/menus.json")
+        menu = await renderer.render_async("Menu1")
+        task.cancel()
+        self.assertGreaterEqual(len(progress) - before, len(menu))
+
+
+class TestVirtualMenu(unittest.IsolatedAsyncioTestCase):
+    """Tests the menus whose pages are loaded on demand from a data source"""
+
+    source = (
+        '<discord><message key="row"><content>{row}</content></message>'
+        '<menu key="menu"><pages><message key="page"><content>page</content></message></pages></menu></discord>'
+    )
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, "rows.xml")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(self.source)
+        self.renderer: Renderer[str] = Renderer(Formatter(), self.path)
+        self.loaded: List[int] = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    async def provider(self, index: int) -> Dict[str, Any]:
+        self.loaded.append(index)
+        return {"row": f"row {index}"}
+
+    async def test_open_prefetches_neighbours(self):
+        menu: VirtualMenu[str] = VirtualMenu(self.renderer, "row", 1000, self.provider, cache_size=4)
+        self.assertEqual(len(menu), 1000)
+        front = await menu.open(10)
+        self.assertEqual(front.content, "row 10")
+        assert front.view is not None
+        self.assertEqual(len(front.view.children), 2)
+        await menu.prefetched()
+        self.assertEqual(sorted(self.loaded), [9, 10, 11])
+        self.assertEqual(menu[11].content, "row 11")
+        self.assertRaises(LookupError, menu.__getitem__, 12)
+
+    async def test_navigation(self):
+        changes: List[int] = []
+
+        async def on_change(menu: Menu) -> None:
+            changes.append(menu.index)
+
+        menu: VirtualMenu[str] = VirtualMenu(
+            self.renderer, "row", 3, self.provider, events={MenuEvents.ON_CHANGE: on_change}, prefetch=0
+        )
+        front = await menu.open()
+        assert front.view is not None
+        interaction = MockedInteraction()
+        with mock.patch.object(type(interaction.response), "edit_message", new_callable=mock.AsyncMock) as edit:
+            await front.view.children[0].callback(interaction)
+            await menu.current_page().view.children[1].callback(interaction)  # type: ignore[union-attr]
+        self.assertEqual(changes, [1, 2])
+        self.assertEqual([call.kwargs["content"] for call in edit.call_args_list], ["row 1", "row 2"])
+        self.assertEqual(self.loaded, [0, 1, 2])
+
+    async def test_lru(self):
+        menu: VirtualMenu[str] = VirtualMenu(self.renderer, "row", 10, self.provider, cache_size=2, prefetch=0)
+        for index in (0, 1, 0, 2, 0, 1):
+            await menu.load(index)
+        self.assertEqual(self.loaded, [0, 1, 2, 1])
+        with self.assertRaises(IndexError):
+            await menu.load(10)
+
+    def test_cache_holds_prefetched_pages(self):
+        self.assertRaises(ValueError, VirtualMenu, self.renderer, "row", 10, self.provider, cache_size=2, prefetch=1)
+        VirtualMenu(self.renderer, "row", 10, self.provider, cache_size=3, prefetch=1)
+
+    async def test_timeout_cancels_prefetch(self):
+        timeouts: List[discord.ui.View] = []
+        release = asyncio.Event()
+
+        async def provider(index: int) -> Dict[str, Any]:
+            if index > 0:
+                await release.wait()
+            return await self.provider(index)
+
+        async def on_timeout(view: discord.ui.View) -> None:
+            timeouts.append(view)
+
+        menu: VirtualMenu[str] = VirtualMenu(
+            self.renderer, "row", 3, provider, events={ViewEvents.ON_TIMEOUT: on_timeout}
+        )
+        front = await menu.open()
+        assert front.view is not None
+        await asyncio.sleep(0)
+        await front.view.on_timeout()
+        await menu.prefetched()
+        self.assertEqual(timeouts, [front.view])
+        self.assertEqual(self.loaded, [0])
+        self.assertRaises(LookupError, menu.__getitem__, 1)
+
+    async def test_failed_prefetch(self):
+        async def provider(index: int) -> Dict[str, Any]:
+            if index == 1:
+                raise ConnectionError("database is down")
+            return await self.provider(index)
+
+        menu: VirtualMenu[str] = VirtualMenu(self.renderer, "row", 2, provider)
+        await menu.open()
+        await menu.prefetched()
+        with self.assertRaises(ConnectionError):
+            await menu.load(1)
+
+    async def test_pages_are_messages(self):
+        menu: VirtualMenu[str] = VirtualMenu(self.renderer, "menu", 2, self.provider)
+        with self.assertRaises(TypeError):
+            await menu.open()
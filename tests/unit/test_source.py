@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qalib.renderer import Renderer, RenderingOptions
+from qalib.template_engines.formatter import Formatter
+from qalib.translators import Message
+from qalib.translators.source import FileSource, InMemorySource
+
+SOURCE = '<discord><message key="a"><content>%s {name}</content></message></discord>'
+
+
+class TestSources(unittest.TestCase):
+    def setUp(self) -> None:
+        file = tempfile.NamedTemporaryFile("w", suffix=".xml", delete=False, encoding="utf-8")
+        with file:
+            file.write(SOURCE % "Hello")
+        self.filename = file.name
+
+    def tearDown(self) -> None:
+        os.remove(self.filename)
+
+    def rewrite(self, greeting: str) -> None:
+        with open(self.filename, "w", encoding="utf-8") as file:
+            file.write(SOURCE % greeting)
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_file_source_is_cached(self):
+        source = FileSource(self.filename)
+        self.assertEqual(source.read(), SOURCE % "Hello")
+        with mock.patch("builtins.open") as mocked_open:
+            self.assertEqual(source.read(), SOURCE % "Hello")
+            mocked_open.assert_not_called()
+
+    def test_file_source_is_invalidated(self):
+        source = FileSource(self.filename)
+        source.read()
+        self.rewrite("Goodbye")
+        self.assertEqual(source.read(), SOURCE % "Goodbye")
+
+    def test_in_memory_source(self):
+        source = InMemorySource(self.filename)
+        self.rewrite("Goodbye")
+        self.assertEqual(source.read(), SOURCE % "Hello")
+        self.assertEqual(InMemorySource(self.filename, "text").read(), "text")
+
+    def test_pre_template_renderer_reloads(self):
+        renderer: Renderer[str] = Renderer(Formatter(), self.filename, RenderingOptions.PRE_TEMPLATE)
+        message = renderer.render("a", keywords={"name": "World"})
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "Hello World")
+        self.rewrite("Goodbye")
+        message = renderer.render("a", keywords={"name": "World"})
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "Goodbye World")
+
+    def test_in_memory_renderer(self):
+        renderer: Renderer[str] = Renderer(
+            Formatter(), self.filename, RenderingOptions.PRE_TEMPLATE, RenderingOptions.IN_MEMORY
+        )
+        self.rewrite("Goodbye")
+        message = renderer.render("a", keywords={"name": "World"})
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "Hello World")
+
+    def test_single_pass(self):
+        keywords = {"name": "{greeting}", "greeting": "Hi"}
+        renderer: Renderer[str] = Renderer(Formatter(), self.filename, RenderingOptions.PRE_TEMPLATE)
+        message = renderer.render("a", keywords=keywords)
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "Hello Hi")
+
+        renderer = Renderer(Formatter(), self.filename, RenderingOptions.PRE_TEMPLATE, RenderingOptions.SINGLE_PASS)
+        message = renderer.render("a", keywords=keywords)
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "Hello {greeting}")
+
+    def test_single_pass_templates_once(self):
+        engine = mock.MagicMock(wraps=Formatter())
+        renderer: Renderer[str] = Renderer(
+            engine, self.filename, RenderingOptions.PRE_TEMPLATE, RenderingOptions.SINGLE_PASS
+        )
+        renderer.render("a", keywords={"name": "World"})
+        engine.template.assert_called_once()
+
+    def test_single_pass_requires_pre_template(self):
+        self.assertRaises(ValueError, Renderer, Formatter(), self.filename, RenderingOptions.SINGLE_PASS)
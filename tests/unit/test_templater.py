@@ -0,0 +1,353 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from typing import Any, Dict, List, cast
+from xml.etree import ElementTree
+
+from discord import ui
+from jinja2 import BaseLoader, Environment
+
+from qalib.renderer import Renderer, RenderingOptions
+from qalib.template_engines.formatter import Formatter
+from qalib.template_engines.jinja2 import Jinja2
+from qalib.template_engines.template_engine import TemplateEngine
+from qalib.translators import Message
+from qalib.translators.menu import Menu
+from qalib.translators.factory import DeserializerFactory, TemplaterFactory
+from qalib.translators.json import JSONTemplater
+from qalib.translators.templater import Templater
+from qalib.translators.xml import XMLTreeTemplater, index_elements
+from qalib.translators.xml.fragments import split_fragments
+
+
+class RecordingFormatter(Formatter):
+    """Formatter that records every document that it templates."""
+
+    def __init__(self) -> None:
+        self.documents: List[str] = []
+
+    def template(self, document: str, keywords: Dict[str, Any]) -> str:
+        self.documents.append(document)
+        return super().template(document, keywords)
+
+
+class TestKeyScopedTemplating(unittest.TestCase):
+    """Tests that only the requested element is templated"""
+
+    def test_json_only_templates_key(self):
+        engine = RecordingFormatter()
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.json")
+        document = json.loads(templater.template_key("Launch", engine, {}))
+        self.assertEqual(list(document), ["Launch"])
+        self.assertNotIn("teal", engine.documents)
+
+    def test_json_menu_includes_pages(self):
+        source = {
+            "menu": {"type": "menu", "pages": ["page", {"type": "message", "content": "inline"}]},
+            "page": {"type": "message", "content": "referenced"},
+            "other": {"type": "message", "content": "other"},
+        }
+        templater = TemplaterFactory.get_templater("test.json", source=json.dumps(source))
+        document = json.loads(templater.template_key("menu", RecordingFormatter(), {}))
+        self.assertEqual(set(document), {"menu", "page"})
+
+    def test_json_missing_key(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.json")
+        self.assertRaises(KeyError, templater.template_key, "not_a_key", RecordingFormatter(), {})
+
+    def test_xml_only_templates_key(self):
+        engine = RecordingFormatter()
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.xml")
+        document = ElementTree.fromstring(templater.template_key("Launch", engine, {}))
+        self.assertEqual([element.get("key") for element in document], ["Launch"])
+        self.assertNotIn('key="Launch2"', engine.documents[0])
+
+    def test_xml_menu_includes_pages(self):
+        templater = TemplaterFactory.get_templater("tests/routes/menus.xml")
+        document = ElementTree.fromstring(templater.template_key("Menu4", RecordingFormatter(), {}))
+        self.assertEqual([element.get("key") for element in document], ["Menu4", "test"])
+
+    def test_xml_missing_key(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.xml")
+        self.assertRaises(KeyError, templater.template_key, "not_a_key", RecordingFormatter(), {})
+
+    def test_xml_unsplittable_document(self):
+        source = '<discord>{% if x %}<message key="a"></message>{% endif %}</discord>'
+        self.assertIsNone(split_fragments(source))
+        templater = TemplaterFactory.get_templater("test.xml", source=source)
+        self.assertEqual(templater.template_key("a", RecordingFormatter(), {}), source)
+
+    def test_xml_fragments_are_split_lazily(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.xml")
+        with mock.patch("qalib.translators.xml.split_fragments", wraps=split_fragments) as split:
+            templater.template(RecordingFormatter(), {})
+            split.assert_not_called()
+            templater.template_key("Launch", RecordingFormatter(), {})
+            templater.template_key("Launch", RecordingFormatter(), {})
+            split.assert_called_once()
+
+    @mock.patch("asyncio.get_running_loop")
+    def test_templated_page_reference(self, _: mock.MagicMock):
+        sources = {
+            ".json": '{"menu": {"type": "menu", "pages": ["{page}"]}, "a": {"type": "message", "content": "a"}}',
+            ".xml": '<discord><menu key="menu"><pages><page key="{page}"/></pages></menu>'
+            '<message key="a"><content>a</content></message></discord>',
+        }
+        for extension, source in sources.items():
+            for options in ((), (RenderingOptions.PARSE_ONCE,)):
+                with tempfile.TemporaryDirectory() as directory:
+                    path = os.path.join(directory, "menus" + extension)
+                    with open(path, "w", encoding="utf-8") as file:
+                        file.write(source)
+                    menu = Renderer(Formatter(), path, *options).render("menu", keywords={"page": "a"})
+                assert isinstance(menu, Menu)
+                self.assertEqual(menu.front.content, "a")
+
+    def test_xml_fragment_with_quoted_angle_bracket(self):
+        source = '<discord>\n<message key="a>b"/>\n<message key="c"><content>c</content></message>\n</discord>'
+        fragments = split_fragments(source)
+        assert fragments is not None
+        self.assertEqual(fragments.elements["a>b"], '<message key="a>b"/>')
+        self.assertEqual(fragments.elements["c"], '<message key="c"><content>c</content></message>')
+
+
+class TestStructuredHandoff(unittest.TestCase):
+    """Tests that the templaters hand over parsed documents to the deserializers"""
+
+    def test_json_template_document(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.json")
+        document = templater.template_document("Launch", Formatter(), {})
+        self.assertIsInstance(document, dict)
+        self.assertEqual(document["Launch"]["embed"]["title"], "Hello World")
+
+    def test_xml_template_document(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.xml")
+        document = templater.template_document("Launch", Formatter(), {})
+        self.assertIsInstance(document, ElementTree.Element)
+
+    def test_json_deserialize_document(self):
+        templater = TemplaterFactory.get_templater("tests/routes/simple_embeds.json")
+        document = templater.template_document("Launch", Formatter(), {})
+        message = DeserializerFactory.get_deserializer("test.json").deserialize_document(document, "Launch", {}, {})
+        assert isinstance(message, Message)
+        assert message.embed is not None
+        self.assertEqual(message.embed.title, "Hello World")
+
+    def test_string_fallback(self):
+        class StringTemplater(Templater):
+            def __init__(self, source: str):
+                self._source = source
+
+            def template(self, template_engine: TemplateEngine, keywords: Dict[str, Any]) -> str:
+                return template_engine.template(self._source, keywords)
+
+        with open("tests/routes/simple_embeds.xml", encoding="utf-8") as file:
+            templater = StringTemplater(file.read())
+        document = templater.template_document("Launch", Formatter(), {})
+        self.assertIsInstance(document, str)
+        message = DeserializerFactory.get_deserializer("test.xml").deserialize_document(document, "Launch", {}, {})
+        self.assertIsInstance(message, Message)
+
+
+class TestXMLTreeTemplater(unittest.TestCase):
+    """Tests the XML templater that parses the document once"""
+
+    source = '<discord><message key="a" custom="{attr}"><content>{text}</content>{tail}</message></discord>'
+
+    def test_factory(self):
+        self.assertIs(TemplaterFactory.get_templater_type("test.xml", parse_once=True), XMLTreeTemplater)
+        self.assertIs(TemplaterFactory.get_templater_type("test.json", parse_once=True), JSONTemplater)
+
+    def test_templates_text_tail_and_attributes(self):
+        templater = XMLTreeTemplater(self.source)
+        keywords = {"attr": "x", "text": "y", "tail": "z"}
+        document = templater.template_document("a", Formatter(), keywords)
+        element = document[0]
+        self.assertEqual(element.get("custom"), "x")
+        self.assertEqual(element[0].text, "y")
+        self.assertEqual(element[0].tail, "z")
+
+    def test_does_not_mutate_parsed_document(self):
+        templater = XMLTreeTemplater(self.source)
+        templater.template_document("a", Formatter(), {"text": "first"})
+        document = templater.template_document("a", Formatter(), {"text": "second"})
+        self.assertEqual(document[0][0].text, "second")
+
+    def test_markup_in_keywords_is_kept_as_text(self):
+        templater = XMLTreeTemplater(self.source)
+        document = templater.template_document("a", Formatter(), {"text": "<b>&</b>"})
+        self.assertEqual(document[0][0].text, "<b>&</b>")
+
+
+class TestStaticSubtrees(unittest.TestCase):
+    """Tests that static subtrees of the documents are not sent through the template engine"""
+
+    def test_formatter_is_static(self):
+        self.assertTrue(Formatter().is_static("Hello World"))
+        self.assertFalse(Formatter().is_static("Hello {name}"))
+        self.assertFalse(Formatter().is_static("{{escaped}}"))
+
+    def test_jinja2_is_static(self):
+        engine = Jinja2()
+        self.assertTrue(engine.is_static("Hello World"))
+        self.assertFalse(engine.is_static("Hello {{ name }}"))
+        self.assertFalse(engine.is_static("{% if x %}x{% endif %}"))
+        self.assertFalse(engine.is_static("{# comment #}"))
+        self.assertFalse(engine.is_static("trailing\n"))
+
+    def test_json_skips_static_strings(self):
+        source = {"a": {"type": "message", "content": "Hello {name}", "embed": {"title": "static", "colour": "teal"}}}
+        engine = RecordingFormatter()
+        templater = JSONTemplater(json.dumps(source))
+        document = templater.template_document("a", engine, {"name": "World"})
+        self.assertEqual(engine.documents, ["Hello {name}"])
+        self.assertEqual(document["a"]["content"], "Hello World")
+        self.assertEqual(document["a"]["embed"], source["a"]["embed"])
+
+    def test_xml_skips_static_elements(self):
+        source = (
+            '<discord><message key="a"><content>Hello {name}</content><embed><title>static</title></embed></message>'
+            "</discord>"
+        )
+        engine = RecordingFormatter()
+        templater = XMLTreeTemplater(source)
+        document = templater.template_document("a", engine, {"name": "World"})
+        self.assertEqual(engine.documents, ["Hello {name}"])
+        self.assertEqual(document[0].findtext("content"), "Hello World")
+        self.assertEqual(document[0].findtext("embed/title"), "static")
+
+    def test_static_nodes_are_analysed_per_engine(self):
+        templater = JSONTemplater(json.dumps({"a": {"type": "message", "content": "{{ name }}"}}))
+        self.assertEqual(templater.template_document("a", Formatter(), {"name": "x"})["a"]["content"], "{ name }")
+        self.assertEqual(templater.template_document("a", Jinja2(), {"name": "x"})["a"]["content"], "x")
+
+    def test_static_nodes_are_shared_by_engines_with_same_syntax(self):
+        templater = JSONTemplater(json.dumps({"a": {"type": "message", "content": "{name}"}}))
+        environment = Environment(loader=BaseLoader(), autoescape=True)
+        with mock.patch.object(Formatter, "is_static", autospec=True, side_effect=Formatter.is_static) as formatter:
+            with mock.patch.object(Jinja2, "is_static", autospec=True, side_effect=Jinja2.is_static) as jinja:
+                for engine in (Formatter(), Formatter(), Jinja2(environment), Jinja2(environment), Jinja2()):
+                    templater.template_document("a", engine, {"name": "x"})
+        self.assertEqual(formatter.call_count, jinja.call_count // 2)
+
+
+class TestCopyOnWriteTemplating(unittest.TestCase):
+    """Tests that the JSON templater only copies the branches of the document that changed"""
+
+    source = {
+        "a": {
+            "type": "message",
+            "content": "Hello {name}",
+            "embed": {"title": "static", "fields": [{"name": "x", "value": "y"}]},
+            "view": {"components": {"b": {"type": "button", "label": "{label}"}, "c": {"type": "button"}}},
+        }
+    }
+
+    def test_shares_unchanged_branches(self):
+        templater = JSONTemplater(json.dumps(self.source))
+        parsed = templater.template_document("a", Formatter(), {})
+        document = templater.template_document("a", Formatter(), {"name": "World", "label": "z"})
+        self.assertIsNot(document["a"], parsed["a"])
+        self.assertIs(document["a"]["embed"], parsed["a"]["embed"])
+        self.assertIs(document["a"]["view"]["components"]["c"], parsed["a"]["view"]["components"]["c"])
+        self.assertEqual(document["a"]["view"]["components"]["b"]["label"], "z")
+
+    def test_does_not_mutate_parsed_document(self):
+        templater = JSONTemplater(json.dumps(self.source))
+        templater.template_document("a", Formatter(), {"name": "World", "label": "z"})
+        document = templater.template_document("a", Formatter(), {})
+        self.assertEqual(document["a"], self.source["a"])
+
+    def test_unchanged_strings_are_shared(self):
+        templater = JSONTemplater(json.dumps(self.source))
+        parsed = templater.template_document("a", Formatter(), {})
+        self.assertIs(templater.template_document("a", Formatter(), {})["a"], parsed["a"])
+
+    def test_deserializing_does_not_mutate_document(self):
+        source = {
+            "a": {
+                "type": "message",
+                "view": {
+                    "components": {
+                        "select": {"type": "select", "options": [{"label": "x"}]},
+                        "text": {"type": "text_input", "label": "y"},
+                    }
+                },
+            }
+        }
+        templater = JSONTemplater(json.dumps(source))
+        deserializer = DeserializerFactory.get_deserializer("test.json")
+        callbacks = {"text": lambda *_: None}
+        for _ in range(2):
+            document = templater.template_document("a", Formatter(), {})
+            deserializer.deserialize_document(document, "a", callbacks, {})
+        self.assertEqual(templater.template_document("a", Formatter(), {}), source)
+
+
+class TestReadOnlyDeserialization(unittest.TestCase):
+    """Tests that the XML deserializer does not mutate the documents that it is given"""
+
+    source = (
+        '<discord><message key="a"><view><components>'
+        '<button key="b"><label>b</label><emoji><name>👍</name></emoji></button>'
+        '<select key="s"><options><option><label>x</label><emoji><name>👍</name></emoji></option></options></select>'
+        '<channel_select key="c"><channel_types><channel_type>text</channel_type></channel_types></channel_select>'
+        "</components></view></message></discord>"
+    )
+
+    def test_static_elements_are_shared(self):
+        templater = XMLTreeTemplater(self.source)
+        first = templater.template_document("a", Formatter(), {})
+        second = templater.template_document("a", Formatter(), {})
+        self.assertIs(first[0], second[0])
+
+    def test_deserializing_does_not_mutate_document(self):
+        templater = XMLTreeTemplater(self.source)
+        deserializer = DeserializerFactory.get_deserializer("test.xml")
+        for _ in range(2):
+            message = deserializer.deserialize_document(templater.template_document("a", Formatter(), {}), "a", {}, {})
+            assert isinstance(message, Message) and message.view is not None
+            button, select, channel_select = message.view.children
+            self.assertIsNotNone(cast(ui.Button, button).emoji)
+            self.assertEqual(cast(ui.Select, select).options[0].label, "x")
+            self.assertEqual(len(cast(ui.ChannelSelect, channel_select).channel_types), 1)
+        self.assertEqual(templater.template_key("a", Formatter(), {}), self.source)
+
+
+class TestKeyIndex(unittest.TestCase):
+    """Tests the indexing of the elements of the documents by their key"""
+
+    def test_xml_index(self):
+        document = ElementTree.fromstring('<discord><message key="a"/><menu key="b"/></discord>')
+        self.assertEqual(list(index_elements(document)), ["a", "b"])
+
+    def test_xml_duplicate_keys(self):
+        source = '<discord><message key="a"><content>1</content></message><message key="a"/></discord>'
+        with self.assertWarnsRegex(UserWarning, "Duplicate key: a"):
+            XMLTreeTemplater(source)
+        with self.assertWarnsRegex(UserWarning, "Duplicate key: a"):
+            TemplaterFactory.get_templater("test.xml", source=source).template_key("a", Formatter(), {})
+        document = ElementTree.fromstring(source)
+        self.assertIs(index_elements(document, report=False)["a"], document[0])
+        message = DeserializerFactory.get_deserializer("test.xml").deserialize_document(document, "a", {}, {})
+        assert isinstance(message, Message)
+        self.assertEqual(message.content, "1")
+
+    def test_json_duplicate_keys(self):
+        source = '{"a": {"type": "message", "content": "1"}, "a": {"type": "message", "content": "2"}}'
+        with self.assertWarnsRegex(UserWarning, "Duplicate key: a"):
+            templater = JSONTemplater(source)
+        self.assertEqual(templater.template_document("a", Formatter(), {})["a"]["content"], "2")
+
+    def test_json_nested_duplicate_keys(self):
+        templater = JSONTemplater('{"a": {"type": "message", "content": "x", "content": "y"}}')
+        self.assertEqual(templater.template_document("a", Formatter(), {})["a"]["content"], "y")
+
+    def test_xml_menu_pages(self):
+        templater = TemplaterFactory.get_templater("tests/routes/menus.xml", parse_once=True)
+        document = templater.template_document("Menu4", Formatter(), {})
+        menu = DeserializerFactory.get_deserializer("test.xml").deserialize_document(document, "Menu4", {}, {})
+        assert isinstance(menu, Menu)
+        self.assertEqual(len(menu), 1)
@@ -1,14 +1,16 @@
 import datetime
 import unittest
+from xml.etree import ElementTree
 
 import discord.ui
 import mock
 
-from qalib.renderer import Renderer
+from qalib.renderer import Renderer, RenderingOptions
 from qalib.template_engines.formatter import Formatter
 from qalib.template_engines.jinja2 import Jinja2
 from qalib.translators import Message
 from qalib.translators.menu import Menu
+from qalib.translators.xml import XMLDeserializer
 from tests.unit.types import FullEmbeds, ErrorEmbeds, SimpleEmbeds, JinjaEmbeds, CompleteEmbeds
 from tests.unit.utils import render_message
 
@@ -283,3 +285,28 @@ class TestXMLRenderer(unittest.TestCase):
         self.assertEqual(message_lines[0], "- This is a test message")
         self.assertEqual(message_lines[1], "- This is a test message")
         self.assertEqual(message_lines[2], "    - This is a test message")
+
+    def test_parse_once_render(self, _: mock.mock.MagicMock):
+        path = "tests/routes/full_embeds.xml"
+        renderer: Renderer[FullEmbeds] = Renderer(Formatter(), path, RenderingOptions.PARSE_ONCE)
+        now = datetime.datetime.now()
+        message = renderer.render("test_key2", keywords={"todays_date": now})
+        assert isinstance(message, Message)
+        assert message.embed is not None
+        self.assertEqual(message.embed.title, "Test2")
+        self.assertEqual(message.embed.timestamp, now.astimezone())
+        assert message.view is not None
+        self.assertGreater(len(message.view.children), 0)
+
+    def test_parse_once_menu(self, _: mock.mock.MagicMock):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/menus.xml", RenderingOptions.PARSE_ONCE)
+        self.assertIsInstance(renderer.render("Menu4"), Menu)
+
+    def test_parse_once_key_not_exist(self, _: mock.mock.MagicMock):
+        renderer: Renderer[str] = Renderer(Formatter(), "tests/routes/menus.xml", RenderingOptions.PARSE_ONCE)
+        self.assertRaises(KeyError, renderer.render, "not_a_key")
+
+    def test_pop_component_is_deprecated(self, _: mock.mock.MagicMock):
+        element = ElementTree.fromstring("<button><emoji/></button>")
+        with self.assertWarns(DeprecationWarning):
+            self.assertIsNotNone(XMLDeserializer.pop_component(element, "emoji"))